@@ -1,11 +1,18 @@
 from .base import AioYa360Client, Ya360ClientSecrets, Ya360UserRequestParams, Ya360UserCreationParams, Ya360User2fa, \
     Ya360DepartmentParams, Ya360UserName, Ya360GroupParams, Ya360ShortGroupMembers, Ya360GroupMember, \
     Ya360GroupMemberGroupMemberType, Ya360SenderInfo, Ya360SignPosition, Ya360Sign
-from .users import Ya360User
+from .users import Ya360User, Ya360LazyUser
 from .organizations import Ya360Organization
 from .departments import Ya360Department
-from .groups import Ya360Group
+from .groups import Ya360Group, Ya360LazyGroup, Ya360GroupMembersPlan, Ya360GroupMembersSyncResult
+from .directory import Ya360DirectoryIndex
+from .snapshot import Ya360DirectorySnapshot
 from .settings import Ya360Settings
+from .sync import Ya360DirectorySync, Ya360DirectoryDelta, Ya360SyncDelta
+from .store import Ya360SqliteDirectoryStore
+from .provisioning import Ya360UserProvisioner, Ya360ProvisioningReport, Ya360ProvisioningResult
+from .watch import Ya360DirectoryWatcher, Ya360DirectoryEvent
+from .multi_org import Ya360MultiOrgExecutor, Ya360Tenant, Ya360TenantResult
 
 __all__ = [
     "AioYa360Client",
@@ -14,6 +21,12 @@ __all__ = [
     'Ya360Organization',
     'Ya360Department',
     'Ya360Group',
+    'Ya360LazyUser',
+    'Ya360LazyGroup',
+    'Ya360GroupMembersPlan',
+    'Ya360GroupMembersSyncResult',
+    'Ya360DirectoryIndex',
+    'Ya360DirectorySnapshot',
     'Ya360UserRequestParams',
     'Ya360UserCreationParams',
     'Ya360User2fa',
@@ -26,5 +39,17 @@ __all__ = [
     'Ya360SenderInfo',
     'Ya360SignPosition',
     'Ya360Settings',
+    'Ya360DirectorySync',
+    'Ya360DirectoryDelta',
+    'Ya360SyncDelta',
+    'Ya360SqliteDirectoryStore',
+    'Ya360DirectoryWatcher',
+    'Ya360UserProvisioner',
+    'Ya360ProvisioningReport',
+    'Ya360ProvisioningResult',
+    'Ya360DirectoryEvent',
+    'Ya360MultiOrgExecutor',
+    'Ya360Tenant',
+    'Ya360TenantResult',
     'Ya360Sign'
 ]
@@ -1,5 +1,15 @@
+from .cache import Ya360ResponseCache, Ya360CacheStats
 from .client import AioYa360Client
+from .credential_store import Ya360CredentialStore, Ya360IniCredentialStore, Ya360JsonCredentialStore, \
+    Ya360EnvCredentialStore
+from .json_backend import Ya360JsonBackend, Ya360StdlibJsonBackend, Ya360OrjsonBackend, \
+    Ya360MsgspecJsonBackend, get_json_backend
+from .lazy import Ya360LazyModel, Ya360RawField, Ya360NestedField
+from .page_size import Ya360PageSizeTuner
+from .paginator import Ya360PagePaginator, Ya360CursorPaginator
+from .scheduler import Ya360RequestScheduler
 from .request_params import Ya360RequestParams, Ya360OrderType
+from .retry import Ya360RetryPolicy
 from .secrets import Ya360ClientSecrets
 from .shared_classes import Ya360UserContact, Ya360UserName, Ya360UserRequestParams, Ya360UserContactParams, \
     Ya360UserCreationParams, Ya360User2fa, Ya360DepartmentParams, Ya360GroupParams, Ya360ShortGroupMembers, \
@@ -9,8 +19,27 @@ from .urls import Ya360Url
 
 __all__ = [
     'AioYa360Client',
+    'Ya360ResponseCache',
+    'Ya360CacheStats',
+    'Ya360CredentialStore',
+    'Ya360IniCredentialStore',
+    'Ya360JsonCredentialStore',
+    'Ya360EnvCredentialStore',
+    'Ya360JsonBackend',
+    'Ya360StdlibJsonBackend',
+    'Ya360OrjsonBackend',
+    'Ya360MsgspecJsonBackend',
+    'get_json_backend',
+    'Ya360LazyModel',
+    'Ya360RawField',
+    'Ya360NestedField',
+    'Ya360PageSizeTuner',
+    'Ya360PagePaginator',
+    'Ya360CursorPaginator',
     'Ya360RequestParams',
     'Ya360OrderType',
+    'Ya360RequestScheduler',
+    'Ya360RetryPolicy',
     'Ya360ClientSecrets',
     'TokenData',
     'Ya360Url',
@@ -0,0 +1,134 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from .json_backend import Ya360JsonBackend, get_json_backend
+from .request_params import Ya360RequestParams
+
+
+@dataclass
+class Ya360CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class Ya360CacheEntry:
+    value: list[dict]
+    expires_at: float
+    size: int
+
+
+class Ya360ResponseCache:
+    default_ttls: dict[str, float] = {
+        'organizations': 300,
+        'departments': 120,
+        'groups': 60,
+        'users': 60,
+    }
+    dependent_resources: dict[str, tuple[str, ...]] = {
+        'users': ('users', 'groups', 'departments'),
+        'groups': ('groups', 'users'),
+        'departments': ('departments', 'users', 'groups'),
+    }
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 max_bytes: int = 32 * 1024 * 1024,
+                 default_ttl: float = 60,
+                 ttls: Optional[dict[str, float]] = None,
+                 json_backend: Optional[Ya360JsonBackend] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = {**self.default_ttls, **(ttls or {})}
+        self.json_backend = json_backend if json_backend is not None else get_json_backend()
+        self.stats = Ya360CacheStats()
+        self._entries: OrderedDict[tuple[str, str], Ya360CacheEntry] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @staticmethod
+    def key(url: str, params: Optional[Ya360RequestParams] = None) -> tuple[str, str]:
+        return url, json.dumps(params.to_json() if params is not None else {}, sort_keys=True)
+
+    @staticmethod
+    def parse_url(url: str) -> tuple[Optional[str], Optional[str]]:
+        parts = [part for part in url.split('/') if part != '']
+        if parts[:3] == ['directory', 'v1', 'org']:
+            if len(parts) == 3:
+                return None, 'organizations'
+            return parts[3], parts[4] if len(parts) > 4 else None
+        return None, None
+
+    def ttl_for(self, url: str) -> float:
+        _, resource = self.parse_url(url)
+        return self.ttls.get(resource, self.default_ttl)
+
+    def get(self, key: tuple[str, str]) -> Optional[list[dict]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return list(entry.value)
+
+    def set(self, key: tuple[str, str], value: list[dict], size: Optional[int] = None):
+        ttl = self.ttl_for(key[0])
+        if ttl <= 0:
+            return
+        if size is None:
+            size = len(self.json_backend.dumps(value))
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = Ya360CacheEntry(value=list(value), expires_at=time.monotonic() + ttl, size=size)
+        self._size += size
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _remove(self, key: tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def invalidate(self, url: str):
+        org_id, resource = self.parse_url(url)
+        if org_id is not None and resource in self.dependent_resources:
+            prefixes = tuple(
+                f'directory/v1/org/{org_id}/{dependent}/'
+                for dependent in self.dependent_resources[resource]
+            )
+            keys = [key for key in self._entries if key[0].startswith(prefixes)]
+        else:
+            keys = [key for key in self._entries if key[0] == url]
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
@@ -1,312 +1,526 @@
 import asyncio
 import os
 import ssl
-from typing import Union, Optional
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Union, Optional, AsyncIterator
+from urllib.parse import urljoin
 
 import aiohttp
 import certifi
 from aiohttp import ClientSession
+from loguru import logger
 
+from .cache import Ya360ResponseCache
+from .credential_store import Ya360CredentialStore, Ya360IniCredentialStore
+from .json_backend import Ya360JsonBackend, get_json_backend
+from .page_size import Ya360PageSizeTuner
+from .paginator import Ya360PagePaginator, Ya360CursorPaginator
 from .request_params import Ya360RequestParams
+from .retry import Ya360RetryPolicy
+from .scheduler import Ya360RequestScheduler
+from .single_flight import Ya360SingleFlight
 from .secrets import Ya360ClientSecrets
 from .token import TokenData
-from ..exceptions import Ya360Exception
+from ..exceptions import Ya360Exception, Ya360ApiException
+
+if TYPE_CHECKING:
+    from ..directory import Ya360DirectoryIndex
 
 default_ini_file_path = os.path.sep.join(os.path.abspath(__file__).split(os.path.sep)[:-1]) + '/aio_ya_360.ini'
 
 
+@lru_cache(maxsize=None)
+def default_ssl_context() -> ssl.SSLContext:
+    return ssl.create_default_context(cafile=certifi.where())
+
+
 class AioYa360Client:
     base_url = 'https://api360.yandex.net/'
+    oauth_url = 'https://oauth.yandex.ru/token'
     _access_token: Optional[str] = None
     _client_secrets: Optional[Ya360ClientSecrets] = None
     _token_data: Optional[TokenData] = None
     _config_file_name: Optional[str] = None
+    _session: Optional[ClientSession] = None
 
     def __init__(self,
                  base_url: str = None,
                  client_secrets: Ya360ClientSecrets = None,
                  config_file_name: Optional[str] = default_ini_file_path,
+                 pool_size: int = 100,
+                 pool_size_per_host: int = 0,
+                 keepalive_timeout: float = 30,
+                 dns_cache_ttl: Optional[int] = 300,
+                 max_in_flight: int = 16,
+                 rate_limit: Optional[float] = 20.0,
+                 max_rate_limit: Optional[float] = None,
+                 retry_policy: Optional[Ya360RetryPolicy] = None,
+                 cache: Optional[Ya360ResponseCache] = None,
+                 auto_refresh_token: bool = True,
+                 refresh_ahead: float = 300,
+                 credential_store: Optional[Ya360CredentialStore] = None,
+                 page_size: int = 100,
+                 auto_tune_page_size: bool = False,
+                 json_backend: Union[str, Ya360JsonBackend, None] = None,
                  ):
         if base_url is not None:
             self.base_url = base_url
         if client_secrets is not None:
             self._client_secrets = client_secrets
         self._config_file_name = config_file_name
+        self._credential_store = credential_store if credential_store is not None \
+            else Ya360IniCredentialStore(file_name=config_file_name)
+        self._pool_size = pool_size
+        self._pool_size_per_host = pool_size_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._scheduler = Ya360RequestScheduler(
+            max_in_flight=max_in_flight,
+            rate_limit=rate_limit,
+            max_rate_limit=max_rate_limit,
+        )
+        self._retry_policy = retry_policy if retry_policy is not None else Ya360RetryPolicy()
+        self._directory_indexes: dict[str, 'Ya360DirectoryIndex'] = {}
+        self._cache = cache
+        self._generations: dict[Optional[str], int] = {}
+        self._single_flight = Ya360SingleFlight()
+        self._page_size = page_size
+        self._page_size_tuner = Ya360PageSizeTuner(initial_page_size=page_size) if auto_tune_page_size else None
+        self._json_backend = json_backend if isinstance(json_backend, Ya360JsonBackend) \
+            else get_json_backend(json_backend)
+        self._auto_refresh_token = auto_refresh_token
+        self._refresh_ahead = refresh_ahead
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._token_ready = asyncio.Event()
+        self._token_ready.set()
+
+    async def __aenter__(self) -> 'AioYa360Client':
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def _get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ssl=default_ssl_context(),
+                    limit=self._pool_size,
+                    limit_per_host=self._pool_size_per_host,
+                    keepalive_timeout=self._keepalive_timeout,
+                    use_dns_cache=self._dns_cache_ttl is not None,
+                    ttl_dns_cache=self._dns_cache_ttl,
+                ),
+                json_serialize=self._json_backend.dumps
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def scheduler(self) -> Ya360RequestScheduler:
+        return self._scheduler
+
+    @property
+    def retry_policy(self) -> Ya360RetryPolicy:
+        return self._retry_policy
+
+    @property
+    def cache(self) -> Optional[Ya360ResponseCache]:
+        return self._cache
+
+    @property
+    def json_backend(self) -> Ya360JsonBackend:
+        return self._json_backend
+
+    @property
+    def page_size_tuner(self) -> Optional[Ya360PageSizeTuner]:
+        return self._page_size_tuner
+
+    def page_size_for(self, url: str) -> int:
+        if self._page_size_tuner is not None:
+            return self._page_size_tuner.page_size_for(url)
+        return self._page_size
+
+    async def coalesce(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        return await self._single_flight.run(key=key, factory=factory)
+
+    def attach_directory_index(self, index: 'Ya360DirectoryIndex'):
+        self._directory_indexes[str(index.org_id)] = index
+
+    def detach_directory_index(self, org_id: str) -> Optional['Ya360DirectoryIndex']:
+        return self._directory_indexes.pop(str(org_id), None)
+
+    def directory_index(self, org_id: str) -> Optional['Ya360DirectoryIndex']:
+        return self._directory_indexes.get(str(org_id))
 
     @property
     def access_token(self):
         if self._token_data is not None:
             return self._token_data.access_token
 
-    async def start(self) -> Union[str, None]:
-        if os.path.exists(path=self._config_file_name):
-            self._client_secrets = Ya360ClientSecrets.from_config(self._config_file_name)
-            self._token_data = TokenData.from_config(self._config_file_name)
+    async def start(self) -> bool:
+        if self._token_data is not None and self._token_data.is_valid(leeway=self._refresh_ahead):
+            self._schedule_token_refresh()
+            return True
+        if self._credential_store.exists():
+            self._client_secrets = self._credential_store.load_secrets() or self._client_secrets
+            self._token_data = self._credential_store.load_token()
         else:
             if self._client_secrets is None:
                 raise Ya360Exception(message='No client secret provided.')
             else:
-                self._client_secrets.save_to_config(self._config_file_name)
+                self._credential_store.save_secrets(self._client_secrets)
+        if self._token_data is None or not self._token_data.is_valid(leeway=self._refresh_ahead):
+            await self.refresh_access_token()
+        if self._token_data.access_token is not None:
+            self._access_token = self._token_data.access_token
+        self._schedule_token_refresh()
+        return self._access_token is not None
+
+    async def refresh_access_token(self) -> TokenData:
+        return await self.coalesce(
+            key=('oauth',),
+            factory=self._obtain_token
+        )
+
+    async def _obtain_token(self) -> TokenData:
+        stored_token_data = self._credential_store.load_token()
+        if stored_token_data is not None and stored_token_data.is_valid(leeway=self._refresh_ahead) and (
+                self._token_data is None or stored_token_data.access_token != self._token_data.access_token):
+            self._token_data = stored_token_data
+            self._access_token = self._token_data.access_token
+            return self._token_data
+        if self._client_secrets is None:
+            raise Ya360Exception(message='No client secret provided.')
         resp = None
-        async with ClientSession(
-                connector=aiohttp.TCPConnector(
-                    ssl=ssl.create_default_context(
-                        cafile=certifi.where()
-                    )
+        _session = self._get_session()
+        if self._token_data is None:
+            if self._client_secrets.verification_code == '':
+                raise Ya360Exception(
+                    f"""
+
+        AIOYa360Client.start_work. No verification code provided.
+        Verification code is required. You can achieve it by authorizing at 'https://oauth.yandex.ru/authorize?response_type=code&client_id=<your Client ID>'
+        Link for you is 'https://oauth.yandex.ru/authorize?response_type=code&client_id={self._client_secrets.client_id}'
+
+        Receive the verification code and put it in `{self._credential_store.location}` file next to client_id and client_secret.
+
+                     """
                 )
-        ) as _session:
-            if self._token_data is None:
-                if self._client_secrets.verification_code == '':
-                    await _session.close()
+            async with _session.post(
+                    url=self.oauth_url,
+                    headers={
+                        'Content-Type': 'application/x-www-form-urlencoded',
+                    },
+                    data={
+                        'grant_type': 'authorization_code',
+                        'code': self._client_secrets.verification_code,
+                        'client_id': self._client_secrets.client_id,
+                        'client_secret': self._client_secrets.client_secret,
+                    }
+            ) as response:
+                if response.status != 200:
                     raise Ya360Exception(
-                        f"""
-    
-            AIOYa360Client.start_work. No verification code provided.
-            Verification code is required. You can achieve it by authorizing at 'https://oauth.yandex.ru/authorize?response_type=code&client_id=<your Client ID>'
-            Link for you is 'https://oauth.yandex.ru/authorize?response_type=code&client_id={self._client_secrets.client_id}'
-    
-            Receive the verification code and put it in `{self._config_file_name}` file next to client_id and client_secret.
-    
-                         """
+                        message=f"""
+            AioYa360.start_session Invalid client secrets.
+            API Error description: {await response.json()}
+                        """
                     )
-                async with _session.post(
-                        url='https://oauth.yandex.ru/token',
-                        headers={
-                            'Content-Type': 'application/x-www-form-urlencoded',
-                        },
-                        data={
-                            'grant_type': 'authorization_code',
-                            'code': self._client_secrets.verification_code,
-                            'client_id': self._client_secrets.client_id,
-                            'client_secret': self._client_secrets.client_secret,
-                        }
-                ) as response:
-                    if response.status != 200:
-                        raise Ya360Exception(
-                            message=f"""
-                AioYa360.start_session Invalid client secrets.
-                API Error description: {await response.json()}
-                            """
-                        )
-                    resp = await response.json()
-            else:
-                async with _session.post(
-                        url='https://oauth.yandex.ru/token',
-                        headers={
-                            'Content-type': 'application/x-www-form-urlencoded',
-                        },
-                        data={
-                            'grant_type': 'refresh_token',
-                            'refresh_token': self._token_data.refresh_token,
-                            'client_id': self._client_secrets.client_id,
-                            'client_secret': self._client_secrets.client_secret,
-                        }
-                ) as response:
-                    if response.status != 200:
-                        raise Ya360Exception(
-                            message=f"""
-                AioYa360.start_session Invalid token data. Try to achieve new token by 
-                1. Deleting {self._config_file_name} 
-                2. Remove parameter `verification_code` from ClientSecrets
-                3. Restart the program.
-    
-                API Error description: {await response.json()}
-                            """
-                        )
-                    resp = await response.json()
+                resp = await response.json()
+        else:
+            async with _session.post(
+                    url=self.oauth_url,
+                    headers={
+                        'Content-type': 'application/x-www-form-urlencoded',
+                    },
+                    data={
+                        'grant_type': 'refresh_token',
+                        'refresh_token': self._token_data.refresh_token,
+                        'client_id': self._client_secrets.client_id,
+                        'client_secret': self._client_secrets.client_secret,
+                    }
+            ) as response:
+                if response.status != 200:
+                    raise Ya360Exception(
+                        message=f"""
+            AioYa360.start_session Invalid token data. Try to achieve new token by 
+            1. Deleting {self._credential_store.location} 
+            2. Remove parameter `verification_code` from ClientSecrets
+            3. Restart the program.
+
+            API Error description: {await response.json()}
+                        """
+                    )
+                resp = await response.json()
         if resp is None:
             raise Ya360Exception(
                 message='AioYa360.start_session Unable to work with current parameters'
             )
         self._token_data = TokenData.from_json(resp)
-        self._token_data.save_to_config(config_file_name=self._config_file_name)
+        self._credential_store.save_token(self._token_data)
         if self._token_data.access_token is not None:
             self._access_token = self._token_data.access_token
-        return self._access_token is not None
+        return self._token_data
+
+    def _schedule_token_refresh(self):
+        if not self._auto_refresh_token or self._token_data is None or self._token_data.expires_at is None:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_token_loop())
+
+    async def _refresh_token_loop(self):
+        while True:
+            expires_after = self._token_data.expires_after()
+            await asyncio.sleep(max(expires_after - self._refresh_ahead, expires_after / 2, 1.0))
+            try:
+                await self.refresh_access_token()
+            except Exception as error:
+                logger.warning(f'AioYa360Client. Proactive token refresh failed: {error!r}')
+                await asyncio.sleep(self._retry_policy.max_delay)
+
+    async def _recover_unauthorized(self, access_token: Optional[str]):
+        if self.access_token != access_token:
+            return
+        self._token_ready.clear()
+        try:
+            await self.refresh_access_token()
+        finally:
+            self._token_ready.set()
+
+    def _auth_headers(self, access_token: Optional[str] = None) -> dict:
+        return {
+            'Authorization': f'OAuth {access_token if access_token is not None else self.access_token}',
+        }
+
+    async def _send(self,
+                    method: str,
+                    url: str,
+                    params: Optional[dict] = None,
+                    json: Optional[dict] = None,
+                    access_token: Optional[str] = None,
+                    observer: Optional[Callable[[int, float], None]] = None
+                    ) -> Optional[dict]:
+        async with self._scheduler.slot():
+            started = time.monotonic()
+            async with self._get_session().request(
+                    method=method,
+                    url=urljoin(self.base_url, url),
+                    params=params,
+                    json=json,
+                    headers=self._auth_headers(access_token=access_token)
+            ) as resp:
+                self._scheduler.on_response(status=resp.status, retry_after=resp.headers.get('Retry-After'))
+                if resp.status != 200:
+                    raise Ya360ApiException(
+                        message=f"""
+            Error in request to API.
+            URL: {url}
+            Method: {method}
+            params: {params if params is not None else json if json is not None else ""}
+            Status: {resp.status}
+            API Error description: {await resp.text()}
+                            """,
+                        status=resp.status,
+                        method=method,
+                        url=url
+                    )
+                body = await resp.read()
+                if observer is not None:
+                    observer(len(body), time.monotonic() - started)
+                return self._json_backend.loads(body) if body else None
+
+    async def _request(self,
+                       method: str,
+                       url: str,
+                       params: Optional[dict] = None,
+                       json: Optional[dict] = None,
+                       observer: Optional[Callable[[int, float], None]] = None
+                       ) -> Optional[dict]:
+        if method != 'GET':
+            try:
+                return await self._request_with_retries(method=method, url=url, params=params, json=json)
+            finally:
+                self._invalidate(url)
+        return await self._request_with_retries(method=method, url=url, params=params, json=json, observer=observer)
+
+    def _invalidate(self, url: str):
+        org_id, _ = Ya360ResponseCache.parse_url(url)
+        self._generations[org_id] = self._generations.get(org_id, 0) + 1
+        if self._cache is not None:
+            self._cache.invalidate(url)
+
+    def generation(self, url: str) -> int:
+        org_id, _ = Ya360ResponseCache.parse_url(url)
+        return self._generations.get(org_id, 0)
+
+    async def _request_with_retries(self,
+                                    method: str,
+                                    url: str,
+                                    params: Optional[dict] = None,
+                                    json: Optional[dict] = None,
+                                    observer: Optional[Callable[[int, float], None]] = None
+                                    ) -> Optional[dict]:
+        attempt = 0
+        replayed = False
+        while True:
+            await self._token_ready.wait()
+            access_token = self.access_token
+            try:
+                return await self._send(method=method, url=url, params=params, json=json,
+                                        access_token=access_token, observer=observer)
+            except (Ya360ApiException, aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if isinstance(error, Ya360ApiException) and error.status == 401 and not replayed \
+                        and self._token_data is not None:
+                    replayed = True
+                    await self._recover_unauthorized(access_token=access_token)
+                    continue
+                attempt += 1
+                if attempt >= self._retry_policy.max_attempts or not self._retry_policy.is_retryable(method, error):
+                    if isinstance(error, Ya360ApiException):
+                        raise
+                    raise Ya360ApiException(
+                        message=f"""
+            Connection error in request to API.
+            URL: {url}
+            Method: {method}
+            Error: {error!r}
+                            """,
+                        method=method,
+                        url=url
+                    ) from error
+                await asyncio.sleep(self._retry_policy.backoff(attempt))
+
+    async def fetch_get_one(self,
+                            url: str,
+                            params: Optional[Ya360RequestParams] = None,
+                            observer: Optional[Callable[[int, float], None]] = None
+                            ) -> Optional[dict]:
+        return await self._request(
+            method='GET',
+            url=url,
+            params=params.to_json() if params is not None else None,
+            observer=observer
+        )
+
+    async def fetch_get_many(self,
+                             urls: list[str]
+                             ) -> list[Union[dict, Ya360Exception]]:
+        responses = await asyncio.gather(
+            *[self._fetch_get_cached(url=url) for url in urls],
+            return_exceptions=True
+        )
+        for response in responses:
+            if isinstance(response, BaseException) and not isinstance(response, Ya360Exception):
+                raise response
+        return responses
+
+    async def _fetch_get_cached(self, url: str) -> Optional[dict]:
+        key = Ya360ResponseCache.key(url=url)
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached[0]
+        generation = self.generation(url)
+        response, size = await self.coalesce(
+            key=('GET_ONE', generation, *key),
+            factory=lambda: self._fetch_get_one_sized(url=url)
+        )
+        if self._cache is not None and generation == self.generation(url):
+            self._cache.set(key, [response], size=size)
+        return response
+
+    async def _fetch_get_one_sized(self,
+                                   url: str,
+                                   params: Optional[Ya360RequestParams] = None
+                                   ) -> tuple[Optional[dict], int]:
+        sizes = []
+        response = await self.fetch_get_one(url=url, params=params, observer=lambda size, _: sizes.append(size))
+        return response, sum(sizes)
 
     async def fetch_get(self,
                         url: str,
                         params: Optional[Ya360RequestParams] = None
                         ) -> Optional[list[dict]]:
+        key = Ya360ResponseCache.key(url=url, params=params)
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+        generation = self.generation(url)
+        responses, size = await self.coalesce(
+            key=('GET', generation, *key),
+            factory=lambda: self._fetch_get(url=url, params=params)
+        )
+        if self._cache is not None and responses and generation == self.generation(url):
+            self._cache.set(key, responses, size=size)
+        return list(responses)
 
-        async def inner_get(inner_url: str, inner_params: Optional[Ya360RequestParams] = None):
+    async def _fetch_get(self,
+                         url: str,
+                         params: Optional[Ya360RequestParams] = None
+                         ) -> tuple[list[dict], int]:
+        if params is not None and params.page is not None and params.per_page is not None:
+            paginator = Ya360PagePaginator(client=self, url=url, params=params)
+            return await paginator.collect(), paginator.received_bytes
+        try:
+            response, size = await self._fetch_get_one_sized(url=url, params=params)
+        except Ya360Exception:
+            return list(), 0
+        return [response], size
 
-            async with ClientSession(
-                    base_url=self.base_url,
-                    connector=aiohttp.TCPConnector(
-                        ssl=ssl.create_default_context(
-                            cafile=certifi.where()
-                        )
-                    ),
-                    headers={
-                        'Authorization': f'OAuth {self.access_token}',
-                    }
-            ) as session:
-                async with session.get(
-                        url=inner_url,
-                        params=inner_params.to_json() if inner_params is not None else None
-                ) as resp:
-                    if resp.status != 200:
-                        raise Ya360Exception(
-                            message=f"""
-                Error in request to API.
-                URL: {inner_url}
-                Method: GET
-                params: {inner_params.to_json() if inner_params is not None else ""}
-                                """
-                        )
-                    return await resp.json()
-
-        if params is not None:
-            if params.page is not None and params.per_page is not None:
-                pages = (await inner_get(inner_url=url, inner_params=params)).get('pages')
-                try:
-                    responses = await asyncio.gather(
-                        *[
-                            inner_get(
-                                inner_url=url,
-                                inner_params=Ya360RequestParams(
-                                    page=page,
-                                    per_page=params.per_page,
-                                    orderBy=params.orderBy,
-                                    pageSize=params.pageSize,
-                                    pageToken=params.pageToken,
-                                    parentID=params.parentID,
-                                )
-                            ) for page in range(1, pages + 1)
-                        ],
-                        return_exceptions=True
-                    )
-                except Ya360Exception:
-                    return list()
-                return list(responses)
-            else:
-                try:
-                    response = await inner_get(inner_url=url, inner_params=params)
-                except Ya360Exception:
-                    return list()
-                return [response]
+    async def iter_get(self,
+                       url: str,
+                       params: Optional[Ya360RequestParams] = None,
+                       prefetch: int = 2
+                       ) -> AsyncIterator[dict]:
+        if params is not None and params.page is not None and params.per_page is not None:
+            async for response in Ya360PagePaginator(client=self, url=url, params=params).iter_pages(prefetch=prefetch):
+                yield response
         else:
-            try:
-                response = await inner_get(inner_url=url, inner_params=params)
-            except Ya360Exception:
-                return list()
-            return [response]
+            yield await self.fetch_get_one(url=url, params=params)
+
+    def iter_cursor(self,
+                    url: str,
+                    params: Optional[Ya360RequestParams] = None,
+                    page_size: int = 100
+                    ) -> AsyncIterator[dict]:
+        return Ya360CursorPaginator(client=self, url=url, params=params, page_size=page_size).iter_pages()
+
+    async def fetch_cursor(self,
+                           url: str,
+                           params: Optional[Ya360RequestParams] = None,
+                           page_size: int = 100
+                           ) -> list[dict]:
+        return await Ya360CursorPaginator(client=self, url=url, params=params, page_size=page_size).collect()
 
     async def fetch_patch(self,
                           url: str,
                           params: dict
                           ) -> Optional[dict]:
-        async with ClientSession(
-                base_url=self.base_url,
-                connector=aiohttp.TCPConnector(
-                    ssl=ssl.create_default_context(
-                        cafile=certifi.where()
-                    )
-                ),
-                headers={
-                    'Authorization': f'OAuth {self.access_token}',
-                }
-        ) as session:
-            async with session.patch(
-                    url=url,
-                    params=params
-            ) as resp:
-                if resp.status != 200:
-                    raise Ya360Exception(
-                        message=f"""
-            Error in request to API.
-            URL: {url}
-            Method: PATCH
-            params: {params}
-                            """
-                    )
-                return await resp.json()
+        return await self._request(method='PATCH', url=url, params=params)
 
     async def fetch_put(self,
                         url: str,
                         params: dict
                         ) -> Optional[dict]:
-        async with ClientSession(
-                base_url=self.base_url,
-                connector=aiohttp.TCPConnector(
-                    ssl=ssl.create_default_context(
-                        cafile=certifi.where()
-                    )
-                ),
-                headers={
-                    'Authorization': f'OAuth {self.access_token}',
-                }
-        ) as session:
-            async with session.put(
-                    url=url,
-                    params=params
-            ) as resp:
-                if resp.status != 200:
-                    raise Ya360Exception(
-                        message=f"""
-            Error in request to API.
-            URL: {url}
-            Method: PUT
-            params: {params}
-                            """
-                    )
-                return await resp.json()
+        return await self._request(method='PUT', url=url, json=params)
 
     async def fetch_delete(self,
                            url: str
                            ) -> Optional[dict]:
-        async with ClientSession(
-                base_url=self.base_url,
-                connector=aiohttp.TCPConnector(
-                    ssl=ssl.create_default_context(
-                        cafile=certifi.where()
-                    )
-                ),
-                headers={
-                    'Authorization': f'OAuth {self.access_token}',
-                }
-        ) as session:
-            async with session.delete(
-                    url=url
-            ) as resp:
-                if resp.status != 200:
-                    raise Ya360Exception(
-                        message=f"""
-            Error in request to API.
-            URL: {url}
-            Method: DELETE
-                            """
-                    )
-                return await resp.json()
+        return await self._request(method='DELETE', url=url)
 
     async def fetch_post(self,
                          url: str,
                          params: dict
                          ) -> Optional[dict]:
-        async with ClientSession(
-                base_url=self.base_url,
-                connector=aiohttp.TCPConnector(
-                    ssl=ssl.create_default_context(
-                        cafile=certifi.where()
-                    )
-                ),
-                headers={
-                    'Authorization': f'OAuth {self.access_token}',
-                }
-        ) as session:
-            async with session.post(
-                    url=url,
-                    json=params
-            ) as resp:
-                if resp.status != 200:
-                    print(await resp.json())
-                    raise Ya360Exception(
-                        message=f"""
-            Error in request to API.
-            URL: {url}
-            Method: POST
-            params: {params}
-                            """
-                    )
-                return await resp.json()
+        return await self._request(method='POST', url=url, json=params)
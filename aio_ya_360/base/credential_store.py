@@ -0,0 +1,186 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from configparser import ConfigParser
+from typing import Optional
+
+from .files import atomic_write, file_lock, update_config_file
+from .secrets import Ya360ClientSecrets
+from .token import TokenData
+
+
+class Ya360CredentialStore(ABC):
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        pass
+
+    @abstractmethod
+    def exists(self) -> bool:
+        pass
+
+    @abstractmethod
+    def load_secrets(self) -> Optional[Ya360ClientSecrets]:
+        pass
+
+    @abstractmethod
+    def load_token(self) -> Optional[TokenData]:
+        pass
+
+    @abstractmethod
+    def save_secrets(self, client_secrets: Ya360ClientSecrets):
+        pass
+
+    @abstractmethod
+    def save_token(self, token_data: TokenData):
+        pass
+
+
+class Ya360FileCredentialStore(Ya360CredentialStore, ABC):
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self._mtime: Optional[int] = None
+
+    @property
+    def location(self) -> str:
+        return self.file_name
+
+    def exists(self) -> bool:
+        return os.path.exists(self.file_name)
+
+    def _changed_on_disk(self) -> bool:
+        try:
+            mtime = os.stat(self.file_name).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._mtime:
+            self._mtime = mtime
+            return True
+        return False
+
+    def _remember_mtime(self):
+        try:
+            self._mtime = os.stat(self.file_name).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime = None
+
+
+class Ya360IniCredentialStore(Ya360FileCredentialStore):
+
+    def __init__(self, file_name: str):
+        super().__init__(file_name=file_name)
+        self._config_parser = ConfigParser()
+
+    def _config(self) -> ConfigParser:
+        if self._changed_on_disk():
+            self._config_parser = ConfigParser()
+            self._config_parser.read(self.file_name)
+        return self._config_parser
+
+    def load_secrets(self) -> Optional[Ya360ClientSecrets]:
+        config_parser = self._config()
+        if Ya360ClientSecrets.config_section not in config_parser.sections():
+            return None
+        return Ya360ClientSecrets.from_config_parser(config_parser, self.file_name)
+
+    def load_token(self) -> Optional[TokenData]:
+        return TokenData.from_config_parser(self._config(), self.file_name)
+
+    def save_secrets(self, client_secrets: Ya360ClientSecrets):
+        self._config_parser = update_config_file(self.file_name, client_secrets.to_config_parser)
+        self._remember_mtime()
+
+    def save_token(self, token_data: TokenData):
+        self._config_parser = update_config_file(self.file_name, token_data.to_config_parser)
+        self._remember_mtime()
+
+
+class Ya360JsonCredentialStore(Ya360FileCredentialStore):
+
+    def __init__(self, file_name: str):
+        super().__init__(file_name=file_name)
+        self._data: dict = {}
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.file_name):
+            return {}
+        with open(self.file_name) as json_file:
+            return json.load(json_file)
+
+    def _content(self) -> dict:
+        if self._changed_on_disk():
+            self._data = self._read()
+        return self._data
+
+    def _update(self, section: str, value: dict):
+        with file_lock(self.file_name):
+            data = self._read()
+            data[section] = value
+            atomic_write(self.file_name, json.dumps(data, indent=2))
+            self._data = data
+        self._remember_mtime()
+
+    def load_secrets(self) -> Optional[Ya360ClientSecrets]:
+        data = self._content().get(Ya360ClientSecrets.config_section)
+        return Ya360ClientSecrets.from_json(data) if data is not None else None
+
+    def load_token(self) -> Optional[TokenData]:
+        data = self._content().get(TokenData.config_section)
+        return TokenData.from_json(data) if data is not None else None
+
+    def save_secrets(self, client_secrets: Ya360ClientSecrets):
+        self._update(Ya360ClientSecrets.config_section, client_secrets.to_json())
+
+    def save_token(self, token_data: TokenData):
+        self._update(TokenData.config_section, token_data.to_json())
+
+
+class Ya360EnvCredentialStore(Ya360CredentialStore):
+
+    def __init__(self, prefix: str = 'YA360_', environ: Optional[dict] = None):
+        self.prefix = prefix
+        self._environ = environ if environ is not None else os.environ
+        self._client_secrets: Optional[Ya360ClientSecrets] = None
+        self._token_data: Optional[TokenData] = None
+
+    @property
+    def location(self) -> str:
+        return f'environment variables {self.prefix}*'
+
+    def _get(self, name: str) -> Optional[str]:
+        return self._environ.get(f'{self.prefix}{name}')
+
+    def exists(self) -> bool:
+        return self._client_secrets is not None or self._get('CLIENT_ID') is not None
+
+    def load_secrets(self) -> Optional[Ya360ClientSecrets]:
+        if self._client_secrets is None and self._get('CLIENT_ID') is not None:
+            self._client_secrets = Ya360ClientSecrets.from_json(
+                data={
+                    'client_id': self._get('CLIENT_ID'),
+                    'client_secret': self._get('CLIENT_SECRET'),
+                    'verification_code': self._get('VERIFICATION_CODE'),
+                }
+            )
+        return self._client_secrets
+
+    def load_token(self) -> Optional[TokenData]:
+        if self._token_data is None and self._get('ACCESS_TOKEN') is not None:
+            self._token_data = TokenData.from_json(
+                data={
+                    'access_token': self._get('ACCESS_TOKEN'),
+                    'expires_in': self._get('TOKEN_EXPIRES_IN') or 0,
+                    'refresh_token': self._get('REFRESH_TOKEN'),
+                    'token_type': self._get('TOKEN_TYPE') or 'bearer',
+                    'expires_at': self._get('TOKEN_EXPIRES_AT'),
+                }
+            )
+        return self._token_data
+
+    def save_secrets(self, client_secrets: Ya360ClientSecrets):
+        self._client_secrets = client_secrets
+
+    def save_token(self, token_data: TokenData):
+        self._token_data = token_data
@@ -0,0 +1,52 @@
+import io
+import os
+import tempfile
+from configparser import ConfigParser
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextmanager
+def file_lock(file_name: str) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    with open(f'{file_name}.lock', 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(file_name: str, text: str):
+    directory = os.path.dirname(os.path.abspath(file_name))
+    descriptor, temp_file_name = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as temp_file:
+            temp_file.write(text)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        if os.path.exists(file_name):
+            os.chmod(temp_file_name, os.stat(file_name).st_mode & 0o777)
+        os.replace(temp_file_name, file_name)
+    except BaseException:
+        if os.path.exists(temp_file_name):
+            os.remove(temp_file_name)
+        raise
+
+
+def update_config_file(config_file_name: str, update: Callable[[ConfigParser], None]) -> ConfigParser:
+    with file_lock(config_file_name):
+        config_parser = ConfigParser()
+        config_parser.read(config_file_name)
+        update(config_parser)
+        buffer = io.StringIO()
+        config_parser.write(buffer)
+        atomic_write(config_file_name, buffer.getvalue())
+    return config_parser
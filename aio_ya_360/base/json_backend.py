@@ -0,0 +1,92 @@
+import json
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Ya360JsonBackend(ABC):
+    name: str
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        pass
+
+    @abstractmethod
+    def dumps(self, value: Any) -> str:
+        pass
+
+
+class Ya360StdlibJsonBackend(Ya360JsonBackend):
+    name = 'json'
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return self._decoder.decode(data)
+
+    def dumps(self, value: Any) -> str:
+        return self._encoder.encode(value)
+
+
+class Ya360OrjsonBackend(Ya360JsonBackend):
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson is not installed')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value).decode('utf-8')
+
+
+class Ya360MsgspecJsonBackend(Ya360JsonBackend):
+    name = 'msgspec'
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError('msgspec is not installed')
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, value: Any) -> str:
+        return self._encoder.encode(value).decode('utf-8')
+
+
+json_backends: dict[str, type[Ya360JsonBackend]] = {
+    Ya360StdlibJsonBackend.name: Ya360StdlibJsonBackend,
+    Ya360OrjsonBackend.name: Ya360OrjsonBackend,
+    Ya360MsgspecJsonBackend.name: Ya360MsgspecJsonBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_json_backend(name: Optional[str] = None) -> Ya360JsonBackend:
+    if name is not None:
+        if name not in json_backends:
+            raise ValueError(f'Unknown JSON backend {name!r}, expected one of {", ".join(json_backends)}')
+        return json_backends[name]()
+    if orjson is not None:
+        return Ya360OrjsonBackend()
+    if msgspec is not None:
+        return Ya360MsgspecJsonBackend()
+    return Ya360StdlibJsonBackend()
@@ -0,0 +1,87 @@
+from dataclasses import fields
+from typing import Any, Callable, ClassVar, Optional
+
+
+class Ya360RawField:
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self.name: Optional[str] = None
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+        if self.key is None:
+            self.key = name
+
+    def __get__(self, instance: Optional['Ya360LazyModel'], owner: type) -> Any:
+        if instance is None:
+            return self
+        return instance._data.get(self.key)
+
+    def __set__(self, instance: 'Ya360LazyModel', value: Any):
+        instance._data = {**instance._data, self.key: value}
+
+
+class Ya360NestedField(Ya360RawField):
+
+    def __init__(self,
+                 factory: Callable[[dict], Any],
+                 key: Optional[str] = None,
+                 many: bool = False):
+        super().__init__(key=key)
+        self.factory = factory
+        self.many = many
+
+    def __get__(self, instance: Optional['Ya360LazyModel'], owner: type) -> Any:
+        if instance is None:
+            return self
+        if instance._parsed is None:
+            instance._parsed = {}
+        try:
+            return instance._parsed[self.name]
+        except KeyError:
+            pass
+        raw = instance._data.get(self.key)
+        if raw is None:
+            value = None
+        elif self.many:
+            value = [self.factory(item) for item in raw]
+        else:
+            value = self.factory(raw)
+        instance._parsed[self.name] = value
+        return value
+
+    def __set__(self, instance: 'Ya360LazyModel', value: Any):
+        if instance._parsed is None:
+            instance._parsed = {}
+        instance._parsed[self.name] = value
+
+
+class Ya360LazyModel:
+    __slots__ = ('_data', '_parsed')
+    model: ClassVar[type]
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._parsed: Optional[dict[str, Any]] = None
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'Ya360LazyModel':
+        return cls(data)
+
+    @property
+    def raw(self) -> dict:
+        return self._data
+
+    def materialize(self) -> Any:
+        return self.model(**{field.name: getattr(self, field.name) for field in fields(self.model)})
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Ya360LazyModel):
+            other = other.materialize()
+        return self.materialize() == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(id={self._data.get("id")!r})'
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Ya360PageStats:
+    page_size: int
+    elapsed: float = 0.0
+    size: int = 0
+    pages: int = 0
+
+    @property
+    def average_elapsed(self) -> float:
+        return self.elapsed / self.pages if self.pages else 0.0
+
+    @property
+    def average_size(self) -> float:
+        return self.size / self.pages if self.pages else 0.0
+
+
+class Ya360PageSizeTuner:
+
+    def __init__(self,
+                 initial_page_size: int = 100,
+                 min_page_size: int = 10,
+                 max_page_size: int = 1000,
+                 target_page_seconds: float = 1.0,
+                 max_page_bytes: int = 4 * 1024 * 1024,
+                 min_samples: int = 2):
+        self.initial_page_size = initial_page_size
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.target_page_seconds = target_page_seconds
+        self.max_page_bytes = max_page_bytes
+        self.min_samples = min_samples
+        self._stats: dict[str, Ya360PageStats] = {}
+        self._limits: dict[str, int] = {}
+
+    def page_size_for(self, url: str) -> int:
+        stats = self._stats.get(url)
+        if stats is None:
+            return max(self.min_page_size, min(self.initial_page_size, self.limit_for(url)))
+        return stats.page_size
+
+    def limit_for(self, url: str) -> int:
+        return self._limits.get(url, self.max_page_size)
+
+    def record(self, url: str, page_size: int, size: int, elapsed: float):
+        stats = self._stats.get(url)
+        if stats is None or stats.page_size != page_size:
+            stats = Ya360PageStats(page_size=page_size)
+            self._stats[url] = stats
+        stats.pages += 1
+        stats.size += size
+        stats.elapsed += elapsed
+        if stats.pages < self.min_samples:
+            return
+        next_page_size = self._next_page_size(url=url, stats=stats)
+        if next_page_size != page_size:
+            self._stats[url] = Ya360PageStats(page_size=next_page_size)
+
+    def _next_page_size(self, url: str, stats: Ya360PageStats) -> int:
+        if stats.average_elapsed > self.target_page_seconds * 1.5 or stats.average_size > self.max_page_bytes:
+            return max(self.min_page_size, stats.page_size // 2)
+        if stats.average_elapsed < self.target_page_seconds / 2 and stats.average_size < self.max_page_bytes / 2:
+            return min(self.limit_for(url), stats.page_size * 2)
+        return stats.page_size
+
+    def reject(self, url: str, page_size: int) -> Optional[int]:
+        if page_size <= self.min_page_size:
+            return None
+        limit = max(self.min_page_size, page_size // 2)
+        self._limits[url] = limit
+        self._stats[url] = Ya360PageStats(page_size=limit)
+        return limit
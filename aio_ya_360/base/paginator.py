@@ -0,0 +1,160 @@
+import asyncio
+from collections import deque
+from dataclasses import replace
+from itertools import islice
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from .request_params import Ya360RequestParams
+from ..exceptions import Ya360ApiException, Ya360PartialResultException
+
+if TYPE_CHECKING:
+    from .client import AioYa360Client
+
+
+class Ya360PagePaginator:
+    first_page: int = 1
+
+    def __init__(self,
+                 client: 'AioYa360Client',
+                 url: str,
+                 params: Ya360RequestParams):
+        self._client = client
+        self._url = url
+        self._params = params
+        self.received_bytes = 0
+
+    def page_params(self, page: int) -> Ya360RequestParams:
+        return replace(self._params, page=page)
+
+    def _observe(self, size: int, elapsed: float):
+        self.received_bytes += size
+        tuner = self._client.page_size_tuner
+        if tuner is not None:
+            tuner.record(
+                url=self._url,
+                page_size=self._params.per_page,
+                size=size,
+                elapsed=elapsed
+            )
+
+    async def fetch_page(self, page: int) -> dict:
+        return await self._client.fetch_get_one(
+            url=self._url,
+            params=self.page_params(page),
+            observer=self._observe
+        )
+
+    async def fetch_first_page(self) -> dict:
+        while True:
+            try:
+                return await self.fetch_page(self.first_page)
+            except Ya360ApiException as error:
+                tuner = self._client.page_size_tuner
+                if tuner is None or error.status not in (400, 422):
+                    raise
+                per_page = tuner.reject(url=self._url, page_size=self._params.per_page)
+                if per_page is None:
+                    raise
+                self._params = replace(self._params, per_page=per_page)
+
+    @staticmethod
+    def pages_count(response: dict) -> int:
+        pages = response.get('pages')
+        return int(pages) if pages else 1
+
+    async def collect(self) -> list[dict]:
+        first = await self.fetch_first_page()
+        pages = list(range(self.first_page + 1, self.pages_count(first) + 1))
+        responses: dict[int, dict] = {self.first_page: first}
+        failed: dict[int, Exception] = {}
+        retry_policy = self._client.retry_policy
+        for recovery_round in range(retry_policy.recovery_rounds + 1):
+            if recovery_round > 0:
+                await asyncio.sleep(retry_policy.backoff(recovery_round))
+            results = await asyncio.gather(
+                *[self.fetch_page(page) for page in pages],
+                return_exceptions=True
+            )
+            failed = {}
+            for page, result in zip(pages, results):
+                if isinstance(result, Exception):
+                    failed[page] = result
+                else:
+                    responses[page] = result
+            if not failed:
+                break
+            pages = list(failed)
+        if failed:
+            raise Ya360PartialResultException(
+                message=f"""
+            Unable to fetch pages {list(failed)} of {self._url}.
+            Fetched pages: {sorted(responses)}
+                """,
+                responses=responses,
+                failed_pages=failed
+            )
+        return [responses[page] for page in sorted(responses)]
+
+    async def iter_pages(self, prefetch: int = 2) -> AsyncIterator[dict]:
+        first = await self.fetch_first_page()
+        yield first
+        next_pages = iter(range(self.first_page + 1, self.pages_count(first) + 1))
+        pending: deque[asyncio.Task] = deque(
+            asyncio.ensure_future(self.fetch_page(page)) for page in islice(next_pages, max(prefetch, 1))
+        )
+        try:
+            while pending:
+                response = await pending.popleft()
+                for page in islice(next_pages, 1):
+                    pending.append(asyncio.ensure_future(self.fetch_page(page)))
+                yield response
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class Ya360CursorPaginator:
+
+    def __init__(self,
+                 client: 'AioYa360Client',
+                 url: str,
+                 params: Optional[Ya360RequestParams] = None,
+                 page_size: int = 100):
+        self._client = client
+        self._url = url
+        self._params = params if params is not None else Ya360RequestParams()
+        self._page_size = page_size
+
+    def page_params(self, page_token: Optional[str]) -> Ya360RequestParams:
+        return replace(self._params, pageToken=page_token, pageSize=self._page_size)
+
+    async def fetch_page(self, page_token: Optional[str]) -> dict:
+        return await self._client.fetch_get_one(
+            url=self._url,
+            params=self.page_params(page_token)
+        )
+
+    @staticmethod
+    def next_page_token(response: dict) -> Optional[str]:
+        page_token = response.get('nextPageToken')
+        return str(page_token) if page_token else None
+
+    async def iter_pages(self) -> AsyncIterator[dict]:
+        seen_tokens: set[str] = set()
+        pending: Optional[asyncio.Task] = asyncio.ensure_future(self.fetch_page(self._params.pageToken or None))
+        try:
+            while pending is not None:
+                response = await pending
+                page_token = self.next_page_token(response)
+                if page_token is None or page_token in seen_tokens:
+                    pending = None
+                else:
+                    seen_tokens.add(page_token)
+                    pending = asyncio.ensure_future(self.fetch_page(page_token))
+                yield response
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def collect(self) -> list[dict]:
+        return [response async for response in self.iter_pages()]
@@ -0,0 +1,32 @@
+import asyncio
+import random
+from dataclasses import dataclass
+
+import aiohttp
+
+from ..exceptions import Ya360ApiException
+
+
+@dataclass
+class Ya360RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    non_idempotent_retry_statuses: tuple[int, ...] = (429,)
+    non_idempotent_methods: tuple[str, ...] = ('POST',)
+    recovery_rounds: int = 1
+
+    def is_retryable(self, method: str, error: BaseException) -> bool:
+        if isinstance(error, Ya360ApiException):
+            if error.status is None:
+                return method not in self.non_idempotent_methods
+            if method in self.non_idempotent_methods:
+                return error.status in self.non_idempotent_retry_statuses
+            return error.status in self.retry_statuses
+        if method in self.non_idempotent_methods:
+            return isinstance(error, aiohttp.ClientConnectorError)
+        return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError))
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
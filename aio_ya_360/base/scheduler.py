@@ -0,0 +1,112 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, AsyncIterator
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class Ya360RequestScheduler:
+    throttled_statuses: tuple[int, ...] = (429,)
+
+    def __init__(self,
+                 max_in_flight: int = 16,
+                 rate_limit: Optional[float] = 20.0,
+                 max_rate_limit: Optional[float] = None,
+                 min_rate_limit: float = 1.0,
+                 increase_step: float = 1.0,
+                 decrease_factor: float = 0.5,
+                 decrease_cooldown: float = 1.0,
+                 ):
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._lock = asyncio.Lock()
+        self.max_in_flight = max_in_flight
+        self.rate_limit = rate_limit
+        if max_rate_limit is None and rate_limit is not None:
+            max_rate_limit = rate_limit * 2
+        self.max_rate_limit = max_rate_limit
+        self.min_rate_limit = min_rate_limit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self._tokens = 1.0
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            max(self.rate_limit, 1.0),
+            self._tokens + (now - self._updated_at) * self.rate_limit
+        )
+        self._updated_at = now
+
+    async def _wait_pause(self):
+        while True:
+            now = time.monotonic()
+            if now >= self._paused_until:
+                return
+            await asyncio.sleep(self._paused_until - now)
+
+    async def _acquire_token(self):
+        if self.rate_limit is None:
+            await self._wait_pause()
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate_limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._semaphore:
+            await self._acquire_token()
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+
+    def on_response(self, status: int, retry_after: Optional[str] = None):
+        now = time.monotonic()
+        throttled = status in self.throttled_statuses
+        if throttled:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                self._paused_until = max(self._paused_until, now + delay)
+        if self.rate_limit is None:
+            return
+        if throttled:
+            if now - self._decreased_at >= self.decrease_cooldown:
+                self._decreased_at = now
+                self.rate_limit = max(self.min_rate_limit, self.rate_limit * self.decrease_factor)
+        elif status < 500 and self.rate_limit < self.max_rate_limit:
+            self.rate_limit = min(
+                self.max_rate_limit,
+                self.rate_limit + self.increase_step / max(self.rate_limit, 1.0)
+            )
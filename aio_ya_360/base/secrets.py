@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from aio_ya_360.exceptions import Ya360Exception
+from .files import update_config_file
 
 
 @dataclass
@@ -12,6 +13,8 @@ class Ya360ClientSecrets:
     client_secret: str = ''
     verification_code: Optional[str] = ''
 
+    config_section = 'Yandex360ClientSecret'
+
     @staticmethod
     def from_json(data: dict):
         verification_code: str = ''
@@ -28,37 +31,46 @@ class Ya360ClientSecrets:
             verification_code=verification_code
         )
 
+    def to_json(self) -> dict:
+        return {
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'verification_code': self.verification_code,
+        }
+
     @staticmethod
-    def from_config(config_file_name: str):
+    def from_config_parser(config_parser: ConfigParser, config_file_name: str):
         verification_code: str = ''
+        try:
+            client_id = config_parser.get(Ya360ClientSecrets.config_section, 'client_id')
+            client_secret = config_parser.get(Ya360ClientSecrets.config_section, 'client_secret')
+        except:
+            raise Ya360Exception(f"ClientSecret. Unable to parse client secrets from {config_file_name}.")
+        try:
+            verification_code = config_parser.get(Ya360ClientSecrets.config_section, 'verification_code')
+        except:
+            pass
+        return Ya360ClientSecrets(
+            client_id=client_id,
+            client_secret=client_secret,
+            verification_code=verification_code
+        )
+
+    @staticmethod
+    def from_config(config_file_name: str):
         config_parser = ConfigParser()
         if os.path.exists(config_file_name):
             config_parser.read(config_file_name)
-
-            try:
-                client_id = config_parser.get('Yandex360ClientSecret', 'client_id')
-                client_secret = config_parser.get('Yandex360ClientSecret', 'client_secret')
-            except:
-                raise Ya360Exception(f"ClientSecret. Unable to parse client secrets from {config_file_name}.")
-            try:
-                verification_code = config_parser.get('Yandex360ClientSecret', 'verification_code')
-            except:
-                pass
-            return Ya360ClientSecrets(
-                client_id=client_id,
-                client_secret=client_secret,
-                verification_code=verification_code
-            )
+            return Ya360ClientSecrets.from_config_parser(config_parser, config_file_name)
         return None
 
-    def save_to_config(self, config_file_name: str):
-        config_parser = ConfigParser()
-        config_parser.read(config_file_name)
-        if 'Yandex360ClientSecret' not in config_parser.sections():
-            config_parser.add_section('Yandex360ClientSecret')
-        config_parser.set(section='Yandex360ClientSecret', option='client_id', value=str(self.client_id))
-        config_parser.set(section='Yandex360ClientSecret', option='client_secret', value=str(self.client_secret))
-        config_parser.set(section='Yandex360ClientSecret', option='verification_code',
+    def to_config_parser(self, config_parser: ConfigParser):
+        if self.config_section not in config_parser.sections():
+            config_parser.add_section(self.config_section)
+        config_parser.set(section=self.config_section, option='client_id', value=str(self.client_id))
+        config_parser.set(section=self.config_section, option='client_secret', value=str(self.client_secret))
+        config_parser.set(section=self.config_section, option='verification_code',
                           value=str(self.verification_code))
-        with open(config_file_name, 'w') as configfile:
-            config_parser.write(configfile)
+
+    def save_to_config(self, config_file_name: str):
+        update_config_file(config_file_name, self.to_config_parser)
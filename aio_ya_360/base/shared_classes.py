@@ -6,7 +6,14 @@ from typing import Optional
 from ..exceptions import Ya360Exception
 
 
-@dataclass
+interned_strings: dict[str, str] = {}
+
+
+def intern_str(value: Optional[str]) -> Optional[str]:
+    return interned_strings.setdefault(value, value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Ya360UserContact:
     alias: bool
     label: str
@@ -17,17 +24,21 @@ class Ya360UserContact:
 
     @staticmethod
     def from_json(data: dict) -> 'Ya360UserContact':
+        get = data.get
+        intern = interned_strings.setdefault
+        label = get('label')
+        contact_type = get('type')
         return Ya360UserContact(
-            alias=data.get('alias'),
-            label=data.get('label'),
-            main=data.get('main'),
-            synthetic=data.get('synthetic'),
-            type=data.get('type'),
-            value=data.get('value')
+            get('alias'),
+            intern(label, label),
+            get('main'),
+            get('synthetic'),
+            intern(contact_type, contact_type),
+            get('value')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360UserName:
     first: str
     last: str
@@ -35,11 +46,8 @@ class Ya360UserName:
 
     @staticmethod
     def from_json(data: dict):
-        return Ya360UserName(
-            first=data.get('first'),
-            last=data.get('last'),
-            middle=data.get('middle'),
-        )
+        get = data.get
+        return Ya360UserName(get('first'), get('last'), get('middle'))
 
     def to_json(self) -> dict:
         result = dict()
@@ -289,7 +297,10 @@ class Ya360GroupMemberGroupMemberType(enum.Enum):
     department = 'department'
 
 
-@dataclass
+group_member_types = {member_type.value: member_type for member_type in Ya360GroupMemberGroupMemberType}
+
+
+@dataclass(slots=True)
 class Ya360GroupMember:
     id: str
     type: str
@@ -304,9 +315,7 @@ class Ya360GroupMember:
     def from_json(data: dict):
         return Ya360GroupMember(
             id=data.get('id'),
-            type=Ya360GroupMemberGroupMemberType.group if data.get(
-                'type') == 'group' else Ya360GroupMemberGroupMemberType.department if data.get(
-                'type') == 'department' else Ya360GroupMemberGroupMemberType.user
+            type=group_member_types.get(data.get('type'), Ya360GroupMemberGroupMemberType.user)
         )
 
     def to_json(self) -> dict:
@@ -360,22 +369,22 @@ class Ya360GroupParams:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360ShortDepartment:
     id: str = None
     name: str = None
     membersCount: str = None
 
-    def from_json(self, data: dict) -> 'Ya360ShortDepartment':
-        if data.get('id') is not None:
-            self.id = data['id']
-        if data.get('name') is not None:
-            self.name = data['name']
-        if data.get('membersCount') is not None:
-            self.membersCount = data['membersCount']
+    @staticmethod
+    def from_json(data: dict) -> 'Ya360ShortDepartment':
+        return Ya360ShortDepartment(
+            id=data['id'] if data.get('id') is not None else None,
+            name=data['name'] if data.get('name') is not None else None,
+            membersCount=data['membersCount'] if data.get('membersCount') is not None else None,
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360ShortGroup:
     id: str = None
     name: str = None
@@ -390,7 +399,7 @@ class Ya360ShortGroup:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360ShortUser:
     avatarId: str = None
     departmentId: str = None
@@ -407,15 +416,15 @@ class Ya360ShortUser:
             avatarId=data.get('avatarId'),
             departmentId=data.get('departmentId'),
             email=data.get('email'),
-            gender=data.get('gender'),
+            gender=intern_str(data.get('gender')),
             id=data.get('id'),
-            name=Ya360UserName.from_json(data.get('name')),
+            name=Ya360UserName.from_json(data.get('name')) if data.get('name') is not None else None,
             nickname=data.get('nickname'),
             position=data.get('position'),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360ShortGroupMembers:
     departments: list[Ya360ShortDepartment] = None
     groups: list[Ya360ShortGroup] = None
@@ -423,9 +432,9 @@ class Ya360ShortGroupMembers:
 
     @staticmethod
     def from_json(data: dict) -> 'Ya360ShortGroupMembers':
-        departments = None
-        groups = None
-        users = None
+        departments = []
+        groups = []
+        users = []
         if data.get('departments') is not None:
             departments = data.get('departments')
         if data.get('groups') is not None:
@@ -438,13 +447,23 @@ class Ya360ShortGroupMembers:
             users=[Ya360ShortUser.from_json(user) for user in users],
         )
 
+    def to_members(self) -> list[Ya360GroupMember]:
+        return [
+            *[Ya360GroupMember(id=str(user.id), type=Ya360GroupMemberGroupMemberType.user)
+              for user in self.users or []],
+            *[Ya360GroupMember(id=str(group.id), type=Ya360GroupMemberGroupMemberType.group)
+              for group in self.groups or []],
+            *[Ya360GroupMember(id=str(department.id), type=Ya360GroupMemberGroupMemberType.department)
+              for department in self.departments or []],
+        ]
+
 
 class Ya360SignPosition(enum.Enum):
     bottom: str = 'bottom'
     under: str = 'under'
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360Sign:
     emails: list[str]
     isDefault: bool
@@ -456,7 +475,7 @@ class Ya360Sign:
         return Ya360Sign(
             emails=data['emails'],
             isDefault=data['isDefault'],
-            lang=data['lang'],
+            lang=intern_str(data['lang']),
             text=data['text'],
         )
 
@@ -469,7 +488,7 @@ class Ya360Sign:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360SenderInfo:
     defaultFrom: str = None
     fromName: str = None
@@ -0,0 +1,25 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class Ya360SingleFlight:
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
@@ -1,31 +1,70 @@
 import os
+import time
 from configparser import ConfigParser
 from dataclasses import dataclass
+from typing import Optional
 
 from aio_ya_360.exceptions import Ya360Exception
+from .files import update_config_file
 
 
 @dataclass
 class TokenData:
     access_token: str = None
-    expires_in: str = None
+    expires_in: int = None
     refresh_token: str = None
     token_type: str = None
+    expires_at: Optional[float] = None
+
+    config_section = 'Yandex360TokenData'
 
     @staticmethod
-    def from_json(data: dict):
+    def from_json(data: dict, issued_at: Optional[float] = None):
         try:
             access_token = data['access_token']
-            expires_in = data['expires_in']
+            expires_in = int(data['expires_in'])
             refresh_token = data['refresh_token']
             token_type = data['token_type']
         except:
             raise Ya360Exception("TokenData. Unable to parse json data.")
+        expires_at = data.get('expires_at')
+        if expires_at is None:
+            expires_at = (issued_at if issued_at is not None else time.time()) + expires_in
+        return TokenData(
+            access_token=access_token,
+            expires_in=expires_in,
+            refresh_token=refresh_token,
+            token_type=token_type,
+            expires_at=float(expires_at)
+        )
+
+    def to_json(self) -> dict:
+        return {
+            'access_token': self.access_token,
+            'expires_in': self.expires_in,
+            'refresh_token': self.refresh_token,
+            'token_type': self.token_type,
+            'expires_at': self.expires_at,
+        }
+
+    @staticmethod
+    def from_config_parser(config_parser: ConfigParser, config_file_name: str):
+        if TokenData.config_section not in config_parser.sections():
+            return None
+        try:
+            access_token = config_parser.get(TokenData.config_section, 'access_token')
+            expires_in = config_parser.getint(TokenData.config_section, 'expires_in')
+            refresh_token = config_parser.get(TokenData.config_section, 'refresh_token')
+            token_type = config_parser.get(TokenData.config_section, 'token_type')
+            expires_at = config_parser.getfloat(TokenData.config_section, 'expires_at', fallback=None)
+        except:
+            raise Ya360Exception(f"TokenData. Unable to parse token data from {config_file_name}")
         return TokenData(
             access_token=access_token,
             expires_in=expires_in,
             refresh_token=refresh_token,
-            token_type=token_type
+            token_type=token_type,
+            expires_at=expires_at
         )
 
     @staticmethod
@@ -33,31 +72,27 @@ class TokenData:
         config_parser = ConfigParser()
         if os.path.exists(config_file_name):
             config_parser.read(config_file_name)
-            if 'Yandex360TokenData' in config_parser.sections():
-                try:
-                    access_token = config_parser.get('Yandex360TokenData', 'access_token')
-                    expires_in = config_parser.get('Yandex360TokenData', 'expires_in')
-                    refresh_token = config_parser.get('Yandex360TokenData', 'refresh_token')
-                    token_type = config_parser.get('Yandex360TokenData', 'token_type')
-                except:
-                    raise Ya360Exception(f"TokenData. Unable to parse token data from {config_file_name}")
-                return TokenData(
-                    access_token=access_token,
-                    expires_in=expires_in,
-                    refresh_token=refresh_token,
-                    token_type=token_type
-                )
+            return TokenData.from_config_parser(config_parser, config_file_name)
         else:
             return None
 
+    def expires_after(self, now: Optional[float] = None) -> float:
+        if self.expires_at is None:
+            return 0.0
+        return self.expires_at - (now if now is not None else time.time())
+
+    def is_valid(self, leeway: float = 0) -> bool:
+        return self.access_token is not None and self.expires_after() > leeway
+
+    def to_config_parser(self, config_parser: ConfigParser):
+        if self.config_section not in config_parser.sections():
+            config_parser.add_section(self.config_section)
+        config_parser.set(section=self.config_section, option='access_token', value=str(self.access_token))
+        config_parser.set(section=self.config_section, option='refresh_token', value=str(self.refresh_token))
+        config_parser.set(section=self.config_section, option='expires_in', value=str(self.expires_in))
+        config_parser.set(section=self.config_section, option='token_type', value=str(self.token_type))
+        if self.expires_at is not None:
+            config_parser.set(section=self.config_section, option='expires_at', value=str(self.expires_at))
+
     def save_to_config(self, config_file_name: str):
-        config_parser = ConfigParser()
-        config_parser.read(config_file_name)
-        if 'Yandex360TokenData' not in config_parser.sections():
-            config_parser.add_section('Yandex360TokenData')
-        config_parser.set(section='Yandex360TokenData', option='access_token', value=str(self.access_token))
-        config_parser.set(section='Yandex360TokenData', option='refresh_token', value=str(self.refresh_token))
-        config_parser.set(section='Yandex360TokenData', option='expires_in', value=str(self.expires_in))
-        config_parser.set(section='Yandex360TokenData', option='token_type', value=str(self.token_type))
-        with open(config_file_name, 'w') as configfile:
-            config_parser.write(configfile)
+        update_config_file(config_file_name, self.to_config_parser)
@@ -1,12 +1,12 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, AsyncIterator
 
 from . import AioYa360Client
 from .base import Ya360Url, Ya360RequestParams, Ya360DepartmentParams
 from .exceptions import Ya360Exception
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360Department:
     aliases: list[str]
     createdAt: str
@@ -40,32 +40,73 @@ class Ya360Department:
     async def from_api(client: AioYa360Client,
                        org_id: str,
                        department_ids: Optional[list[str]] = None,
-                       params: Optional[Ya360RequestParams] = None
-                       ) -> Optional[list['Ya360Department']]:
+                       params: Optional[Ya360RequestParams] = None,
+                       per_page: Optional[int] = None
+                       ) -> Optional[list[Optional['Ya360Department']]]:
         if department_ids is not None:
             return [
-                Ya360Department.from_json(
-                    (await client.fetch_get(
-                        url=Ya360Url.department(
+                Ya360Department.from_json(response) if not isinstance(response, Ya360Exception) else None
+                for response in await client.fetch_get_many(
+                    urls=[
+                        Ya360Url.department(
                             org_id=org_id,
                             department_id=department_id
-                        ),
-                    ))[0]
-                ) for department_id in department_ids
+                        ) for department_id in department_ids
+                    ]
+                )
             ]
         else:
-            departments_list = []
-            try:
-                resp = await client.fetch_get(
-                    url=Ya360Url.departments(org_id=org_id),
-                    params=params if params is not None else Ya360RequestParams()
+            departments_list = await client.coalesce(
+                key=('Ya360Department.from_api', org_id, repr(params), per_page,
+                     client.generation(Ya360Url.departments(org_id=org_id))),
+                factory=lambda: Ya360Department._list_from_api(client=client, org_id=org_id, params=params,
+                                                               per_page=per_page)
+            )
+            return list(departments_list) if departments_list is not None else None
+
+    @staticmethod
+    async def _list_from_api(client: AioYa360Client,
+                             org_id: str,
+                             params: Optional[Ya360RequestParams] = None,
+                             per_page: Optional[int] = None
+                             ) -> Optional[list['Ya360Department']]:
+        departments_list = []
+        try:
+            resp = await client.fetch_get(
+                url=Ya360Url.departments(org_id=org_id),
+                params=params if params is not None else Ya360RequestParams(
+                    page=1,
+                    per_page=per_page if per_page is not None else client.page_size_for(
+                        Ya360Url.departments(org_id=org_id)
+                    )
                 )
-            except Ya360Exception:
-                return None
-            for response in resp:
-                for user in response.get('departments'):
-                    departments_list.append(Ya360Department.from_json(user))
-            return departments_list
+            )
+        except Ya360Exception:
+            return None
+        for response in resp:
+            for user in response.get('departments'):
+                departments_list.append(Ya360Department.from_json(user))
+        return departments_list
+
+    @staticmethod
+    async def iter_api(client: AioYa360Client,
+                       org_id: str,
+                       params: Optional[Ya360RequestParams] = None,
+                       per_page: Optional[int] = None,
+                       prefetch: int = 2
+                       ) -> AsyncIterator['Ya360Department']:
+        async for response in client.iter_get(
+                url=Ya360Url.departments(org_id=org_id),
+                params=params if params is not None else Ya360RequestParams(
+                    page=1,
+                    per_page=per_page if per_page is not None else client.page_size_for(
+                        Ya360Url.departments(org_id=org_id)
+                    )
+                ),
+                prefetch=prefetch
+        ):
+            for department in response.get('departments'):
+                yield Ya360Department.from_json(department)
 
     @staticmethod
     async def create_department(client: AioYa360Client,
@@ -75,7 +116,7 @@ class Ya360Department:
         if params.name is None or params.name == "" or params.label is None or params.label == "" or params.parentId is None or params.parentId == "":
             raise Ya360Exception('Name or label or parentId for new department is empty')
         try:
-            return Ya360Department.from_json(
+            department = Ya360Department.from_json(
                 await client.fetch_post(
                     url=Ya360Url.departments(org_id=org_id),
                     params=params.to_json()
@@ -83,6 +124,10 @@ class Ya360Department:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_department(department)
+        return department
 
     @staticmethod
     async def delete_department(client: AioYa360Client,
@@ -90,11 +135,16 @@ class Ya360Department:
                                 department_id: str
                                 ) -> Optional[bool]:
         try:
-            return (await client.fetch_delete(
+            removed = (await client.fetch_delete(
                 url=Ya360Url.department(org_id=org_id, department_id=department_id)
             )).get('removed')
         except Ya360Exception:
             return False
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            if removed:
+                index.remove_department(department_id)
+        return removed
 
     @staticmethod
     async def edit_department(client: AioYa360Client,
@@ -103,7 +153,7 @@ class Ya360Department:
                               params: Ya360DepartmentParams
                               ) -> Optional['Ya360Department']:
         try:
-            return Ya360Department.from_json(
+            department = Ya360Department.from_json(
                 await client.fetch_patch(
                     url=Ya360Url.department(org_id=org_id,
                                             department_id=department_id),
@@ -112,6 +162,10 @@ class Ya360Department:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_department(department)
+        return department
 
     @staticmethod
     async def add_alias(client: AioYa360Client,
@@ -119,7 +173,7 @@ class Ya360Department:
                         department_id: str,
                         alias: str) -> Optional['Ya360Department']:
         try:
-            return Ya360Department.from_json(
+            department = Ya360Department.from_json(
                 await client.fetch_patch(
                     url=Ya360Url.department_aliases(org_id=org_id,
                                                     department_id=department_id),
@@ -130,6 +184,10 @@ class Ya360Department:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_department(department)
+        return department
 
     @staticmethod
     async def delete_alias(client: AioYa360Client,
@@ -137,8 +195,13 @@ class Ya360Department:
                            department_id: str,
                            alias: str) -> Optional[bool]:
         try:
-            return (await client.fetch_delete(
+            removed = (await client.fetch_delete(
                 url=Ya360Url.department_alias(org_id=org_id, department_id=department_id, alias=alias)
             )).get('removed')
         except Ya360Exception:
             return False
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            if removed:
+                index.remove_department_alias(department_id=department_id, alias=alias)
+        return removed
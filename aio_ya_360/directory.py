@@ -0,0 +1,328 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .base import AioYa360Client, Ya360GroupMember
+from .exceptions import Ya360Exception
+
+if TYPE_CHECKING:
+    from .departments import Ya360Department
+    from .groups import Ya360Group
+    from .users import Ya360User
+
+
+def _key(value: Optional[str]) -> Optional[str]:
+    if value is None or value == '':
+        return None
+    return str(value).lower()
+
+
+class Ya360DirectoryIndex:
+
+    def __init__(self,
+                 org_id: str,
+                 users: Iterable['Ya360User'] = (),
+                 groups: Iterable['Ya360Group'] = (),
+                 departments: Iterable['Ya360Department'] = ()):
+        self.org_id = org_id
+        self.users: dict[str, 'Ya360User'] = {}
+        self.groups: dict[str, 'Ya360Group'] = {}
+        self.departments: dict[str, 'Ya360Department'] = {}
+        self._users_by_nickname: dict[str, str] = {}
+        self._users_by_email: dict[str, str] = {}
+        self._users_by_alias: dict[str, str] = {}
+        self._groups_by_label: dict[str, str] = {}
+        self._groups_by_email: dict[str, str] = {}
+        self._departments_by_label: dict[str, str] = {}
+        self._member_groups: Optional[dict[tuple[str, str], set[str]]] = None
+        self._group_ancestors: dict[str, frozenset[str]] = {}
+        self.loaded_at = time.monotonic()
+        for user in users:
+            self.add_user(user)
+        for group in groups:
+            self.add_group(group)
+        for department in departments:
+            self.add_department(department)
+
+    @staticmethod
+    async def from_api(client: AioYa360Client,
+                       org_id: str,
+                       users: bool = True,
+                       groups: bool = True,
+                       departments: bool = True,
+                       attach: bool = False) -> 'Ya360DirectoryIndex':
+        from .departments import Ya360Department
+        from .groups import Ya360Group
+        from .users import Ya360User
+
+        async def nothing() -> list:
+            return []
+
+        users_list, groups_list, departments_list = await asyncio.gather(
+            Ya360User.from_api(client=client, org_id=org_id) if users else nothing(),
+            Ya360Group.from_api(client=client, org_id=org_id) if groups else nothing(),
+            Ya360Department.from_api(client=client, org_id=org_id) if departments else nothing(),
+        )
+        if users_list is None or groups_list is None or departments_list is None:
+            raise Ya360Exception(
+                message=f'Ya360DirectoryIndex. Unable to load directory of organization {org_id}'
+            )
+        index = Ya360DirectoryIndex(org_id=org_id, users=users_list, groups=groups_list, departments=departments_list)
+        if attach:
+            client.attach_directory_index(index)
+        return index
+
+    @staticmethod
+    async def for_client(client: AioYa360Client,
+                         org_id: str,
+                         max_age: Optional[float] = None) -> 'Ya360DirectoryIndex':
+        index = client.directory_index(org_id=org_id)
+        if index is not None and (max_age is None or index.age <= max_age):
+            return index
+        return await Ya360DirectoryIndex.from_api(client=client, org_id=org_id, attach=index is not None)
+
+    @staticmethod
+    async def attached_or_live(client: AioYa360Client,
+                               org_id: str,
+                               users: bool = True,
+                               groups: bool = True,
+                               departments: bool = True) -> 'Ya360DirectoryIndex':
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            return index
+        return await Ya360DirectoryIndex.from_api(
+            client=client,
+            org_id=org_id,
+            users=users,
+            groups=groups,
+            departments=departments
+        )
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def _invalidate_membership(self):
+        self._member_groups = None
+        self._group_ancestors = {}
+
+    def add_user(self, user: 'Ya360User'):
+        user_id = str(user.id)
+        self.remove_user(user_id)
+        self.users[user_id] = user
+        if _key(user.nickname) is not None:
+            self._users_by_nickname[_key(user.nickname)] = user_id
+        if _key(user.email) is not None:
+            self._users_by_email[_key(user.email)] = user_id
+        for alias in user.aliases or []:
+            if _key(alias) is not None:
+                self._users_by_alias[_key(alias)] = user_id
+
+    def remove_user(self, user_id: str) -> Optional['Ya360User']:
+        user = self.users.pop(str(user_id), None)
+        if user is not None:
+            self._users_by_nickname.pop(_key(user.nickname), None)
+            self._users_by_email.pop(_key(user.email), None)
+            for alias in user.aliases or []:
+                self._users_by_alias.pop(_key(alias), None)
+        return user
+
+    def add_user_alias(self, user_id: str, alias: str):
+        user = self.users.get(str(user_id))
+        if user is not None and _key(alias) is not None:
+            if alias not in (user.aliases or []):
+                user.aliases = [*(user.aliases or []), alias]
+            self._users_by_alias[_key(alias)] = str(user_id)
+
+    def remove_user_alias(self, user_id: str, alias: str):
+        user = self.users.get(str(user_id))
+        if user is not None and user.aliases is not None and alias in user.aliases:
+            user.aliases = [current for current in user.aliases if current != alias]
+            self._users_by_alias.pop(_key(alias), None)
+
+    def clear_user_contacts(self, user_id: str):
+        user = self.users.get(str(user_id))
+        if user is not None:
+            user.contacts = []
+
+    def user_by_id(self, user_id: str) -> Optional['Ya360User']:
+        return self.users.get(str(user_id))
+
+    def user_by_nickname(self, nickname: str) -> Optional['Ya360User']:
+        return self.users.get(self._users_by_nickname.get(_key(nickname)))
+
+    def user_by_email(self, email: str) -> Optional['Ya360User']:
+        return self.users.get(self._users_by_email.get(_key(email)))
+
+    def user_by_alias(self, alias: str) -> Optional['Ya360User']:
+        return self.users.get(self._users_by_alias.get(_key(alias)))
+
+    def find_user(self, login: str) -> Optional['Ya360User']:
+        user = self.user_by_email(login)
+        if user is None:
+            local_part = login.split('@', 1)[0]
+            user = self.user_by_nickname(local_part) or self.user_by_alias(local_part)
+        return user
+
+    def nickname_exists(self, nickname: str) -> bool:
+        key = _key(nickname)
+        return key in self._users_by_nickname or key in self._users_by_alias
+
+    def add_group(self, group: 'Ya360Group'):
+        group_id = str(group.id)
+        self.remove_group(group_id)
+        self._invalidate_membership()
+        self.groups[group_id] = group
+        if _key(group.label) is not None:
+            self._groups_by_label[_key(group.label)] = group_id
+        if _key(group.email) is not None:
+            self._groups_by_email[_key(group.email)] = group_id
+
+    def remove_group(self, group_id: str) -> Optional['Ya360Group']:
+        group = self.groups.pop(str(group_id), None)
+        if group is not None:
+            self._invalidate_membership()
+            self._groups_by_label.pop(_key(group.label), None)
+            self._groups_by_email.pop(_key(group.email), None)
+        return group
+
+    def set_group_members(self, group_id: str, members: list[Ya360GroupMember]):
+        group = self.groups.get(str(group_id))
+        if group is not None:
+            group.members = list(members)
+            self._invalidate_membership()
+
+    def add_group_member(self, group_id: str, member: Ya360GroupMember):
+        group = self.groups.get(str(group_id))
+        if group is not None:
+            self.remove_group_member(group_id=group_id, member=member)
+            group.members = [*(group.members or []), member]
+            self._invalidate_membership()
+
+    def remove_group_member(self, group_id: str, member: Ya360GroupMember):
+        group = self.groups.get(str(group_id))
+        if group is not None and group.members is not None:
+            group.members = [
+                current for current in group.members
+                if not (str(current.id) == str(member.id) and current.type == member.type)
+            ]
+            self._invalidate_membership()
+
+    def clear_group_admins(self, group_id: str):
+        group = self.groups.get(str(group_id))
+        if group is not None:
+            group.adminIds = []
+
+    def group_by_id(self, group_id: str) -> Optional['Ya360Group']:
+        return self.groups.get(str(group_id))
+
+    def group_by_label(self, label: str) -> Optional['Ya360Group']:
+        return self.groups.get(self._groups_by_label.get(_key(label)))
+
+    def group_by_email(self, email: str) -> Optional['Ya360Group']:
+        return self.groups.get(self._groups_by_email.get(_key(email)))
+
+    def label_exists(self, label: str) -> bool:
+        return _key(label) in self._groups_by_label
+
+    def add_department(self, department: 'Ya360Department'):
+        department_id = str(department.id)
+        self.remove_department(department_id)
+        self.departments[department_id] = department
+        if _key(department.label) is not None:
+            self._departments_by_label[_key(department.label)] = department_id
+
+    def remove_department(self, department_id: str) -> Optional['Ya360Department']:
+        department = self.departments.pop(str(department_id), None)
+        if department is not None:
+            self._departments_by_label.pop(_key(department.label), None)
+        return department
+
+    def remove_department_alias(self, department_id: str, alias: str):
+        department = self.departments.get(str(department_id))
+        if department is not None and department.aliases is not None and alias in department.aliases:
+            department.aliases = [current for current in department.aliases if current != alias]
+
+    def department_by_id(self, department_id: str) -> Optional['Ya360Department']:
+        return self.departments.get(str(department_id))
+
+    def department_by_label(self, label: str) -> Optional['Ya360Department']:
+        return self.departments.get(self._departments_by_label.get(_key(label)))
+
+    def _membership(self) -> dict[tuple[str, str], set[str]]:
+        if self._member_groups is None:
+            member_groups: dict[tuple[str, str], set[str]] = {}
+            for group_id, group in self.groups.items():
+                for member in group.members or []:
+                    member_groups.setdefault((member.type, str(member.id)), set()).add(group_id)
+            self._member_groups = member_groups
+        return self._member_groups
+
+    def _direct_group_ids(self, member_type: str, member_id: str) -> set[str]:
+        return self._membership().get((member_type, str(member_id)), set())
+
+    def _ancestors_of_group(self, group_id: str) -> frozenset[str]:
+        ancestors = self._group_ancestors.get(group_id)
+        if ancestors is None:
+            found: set[str] = set()
+            stack = list(self._direct_group_ids('group', group_id))
+            while stack:
+                current = stack.pop()
+                if current in found or current == group_id:
+                    continue
+                found.add(current)
+                cached = self._group_ancestors.get(current)
+                if cached is not None:
+                    found.update(cached)
+                else:
+                    stack.extend(self._direct_group_ids('group', current))
+            ancestors = frozenset(found)
+            self._group_ancestors[group_id] = ancestors
+        return ancestors
+
+    def _department_chain(self, department_id: Optional[str]) -> list[str]:
+        chain: list[str] = []
+        while department_id is not None and str(department_id) in self.departments \
+                and str(department_id) not in chain:
+            chain.append(str(department_id))
+            department_id = self.departments[str(department_id)].parentId
+        return chain
+
+    def group_ids_of(self,
+                     member_id: str,
+                     member_type: str = 'user',
+                     transitive: bool = False) -> set[str]:
+        group_ids = set(self._direct_group_ids(member_type, member_id))
+        if not transitive:
+            return group_ids
+        if member_type == 'user':
+            user = self.users.get(str(member_id))
+            if user is not None:
+                for department_id in self._department_chain(user.departmentId):
+                    group_ids.update(self._direct_group_ids('department', department_id))
+        elif member_type == 'department':
+            for department_id in self._department_chain(member_id)[1:]:
+                group_ids.update(self._direct_group_ids('department', department_id))
+        for group_id in list(group_ids):
+            group_ids.update(self._ancestors_of_group(group_id))
+        return group_ids
+
+    def groups_of(self,
+                  member_id: str,
+                  member_type: str = 'user',
+                  transitive: bool = False) -> list['Ya360Group']:
+        return [
+            self.groups[group_id]
+            for group_id in sorted(self.group_ids_of(member_id=member_id,
+                                                     member_type=member_type,
+                                                     transitive=transitive))
+        ]
+
+    def groups_of_many(self,
+                       member_ids: Iterable[str],
+                       member_type: str = 'user',
+                       transitive: bool = False) -> dict[str, list['Ya360Group']]:
+        return {
+            str(member_id): self.groups_of(member_id=member_id, member_type=member_type, transitive=transitive)
+            for member_id in member_ids
+        }
@@ -1,5 +1,8 @@
 from .base_exception import Ya360Exception
+from .api_exception import Ya360ApiException, Ya360PartialResultException
 
 __all__ = [
     'Ya360Exception',
+    'Ya360ApiException',
+    'Ya360PartialResultException',
 ]
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from .base_exception import Ya360Exception
+
+
+class Ya360ApiException(Ya360Exception):
+
+    def __init__(self,
+                 message: str,
+                 status: Optional[int] = None,
+                 method: Optional[str] = None,
+                 url: Optional[str] = None):
+        self.status = status
+        self.method = method
+        self.url = url
+        super().__init__(message)
+
+
+class Ya360PartialResultException(Ya360Exception):
+
+    def __init__(self,
+                 message: str,
+                 responses: dict[int, dict],
+                 failed_pages: dict[int, Exception]):
+        self.responses = responses
+        self.failed_pages = failed_pages
+        super().__init__(message)
@@ -1,14 +1,49 @@
+import asyncio
 import enum
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, AsyncIterator
 
 from . import AioYa360Client
-from .base import Ya360Url, Ya360RequestParams, Ya360GroupParams
-from .base.shared_classes import Ya360GroupMember, Ya360ShortGroupMembers
+from .base import Ya360Url, Ya360RequestParams, Ya360GroupParams, get_json_backend
+from .base.lazy import Ya360LazyModel, Ya360RawField, Ya360NestedField
+from .base.shared_classes import Ya360GroupMember, Ya360ShortGroupMembers, intern_str
+from .directory import Ya360DirectoryIndex
 from .exceptions import Ya360Exception
 
 
 @dataclass
+class Ya360GroupMembersPlan:
+    group_id: str
+    desired: list[Ya360GroupMember]
+    to_add: list[Ya360GroupMember]
+    to_remove: list[Ya360GroupMember]
+    strategy: str
+    replace_bytes: int
+    targeted_bytes: int
+
+    @property
+    def requests(self) -> int:
+        if self.strategy == 'replace':
+            return 1
+        if self.strategy == 'targeted':
+            return len(self.to_add) + len(self.to_remove)
+        return 0
+
+
+@dataclass
+class Ya360GroupMembersSyncResult:
+    plan: Ya360GroupMembersPlan
+    added: list[Ya360GroupMember] = field(default_factory=list)
+    removed: list[Ya360GroupMember] = field(default_factory=list)
+    failed: list[Ya360GroupMember] = field(default_factory=list)
+    replaced: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+@dataclass(slots=True)
 class Ya360Group:
     adminIds: list[str] = None
     aliases: list[str] = None
@@ -28,83 +63,134 @@ class Ya360Group:
 
     @staticmethod
     def from_json(data: dict) -> 'Ya360Group':
+        get = data.get
         return Ya360Group(
-            adminIds=data.get('adminIds'),
-            aliases=data.get('aliases'),
-            authorId=data.get('authorId'),
-            createdAt=data.get('createdAt'),
-            description=data.get('description'),
-            email=data.get('email'),
-            externalId=data.get('externalId'),
-            id=data.get('id'),
-            label=data.get('label'),
-            memberOf=data.get('memberOf'),
-            members=[Ya360GroupMember.from_json(member) for member in data.get('members')],
-            membersCount=data.get('membersCount'),
-            name=data.get('name'),
-            removed=data.get('removed'),
-            type=data.get('type'),
+            get('adminIds'),
+            get('aliases'),
+            get('authorId'),
+            get('createdAt'),
+            get('description'),
+            get('email'),
+            get('externalId'),
+            get('id'),
+            get('label'),
+            get('memberOf'),
+            [Ya360GroupMember.from_json(member) for member in get('members')],
+            get('membersCount'),
+            get('name'),
+            get('removed'),
+            intern_str(get('type')),
         )
 
     @staticmethod
     async def from_api(client: AioYa360Client,
                        org_id: str,
-                       group_ids: Optional[list[str]] = None) -> Optional[list['Ya360Group']]:
+                       group_ids: Optional[list[str]] = None,
+                       per_page: Optional[int] = None,
+                       lazy: bool = False) -> Optional[list[Optional['Ya360Group']]]:
+        model = Ya360LazyGroup if lazy else Ya360Group
         if group_ids is not None:
             return [
-                Ya360Group.from_json(
-                    (await client.fetch_get(
-                        url=Ya360Url.group(
+                model.from_json(response) if not isinstance(response, Ya360Exception) else None
+                for response in await client.fetch_get_many(
+                    urls=[
+                        Ya360Url.group(
                             org_id=org_id,
                             group_id=group_id
-                        ),
-                    ))[0]
-                ) for group_id in group_ids
+                        ) for group_id in group_ids
+                    ]
+                )
             ]
         else:
-            groups_list = []
-            try:
-                resp = await client.fetch_get(
-                    url=Ya360Url.groups(org_id=org_id),
-                    params=Ya360RequestParams(
-                        page=0,
-                        per_page=10
-                    )
+            groups_list = await client.coalesce(
+                key=('Ya360Group.from_api', org_id, per_page, lazy, client.generation(Ya360Url.groups(org_id=org_id))),
+                factory=lambda: Ya360Group._list_from_api(client=client, org_id=org_id, per_page=per_page, lazy=lazy)
+            )
+            return list(groups_list) if groups_list is not None else None
+
+    @staticmethod
+    async def _list_from_api(client: AioYa360Client,
+                             org_id: str,
+                             per_page: Optional[int] = None,
+                             lazy: bool = False
+                             ) -> Optional[list['Ya360Group']]:
+        model = Ya360LazyGroup if lazy else Ya360Group
+        groups_list = []
+        try:
+            resp = await client.fetch_get(
+                url=Ya360Url.groups(org_id=org_id),
+                params=Ya360RequestParams(
+                    page=1,
+                    per_page=per_page if per_page is not None else client.page_size_for(Ya360Url.groups(org_id=org_id))
                 )
-            except Ya360Exception:
-                return None
-            for response in resp:
-                for user in response.get('groups'):
-                    groups_list.append(Ya360Group.from_json(user))
-            return groups_list
+            )
+        except Ya360Exception:
+            return None
+        for response in resp:
+            for user in response.get('groups'):
+                groups_list.append(model.from_json(user))
+        return groups_list
+
+    @staticmethod
+    async def iter_api(client: AioYa360Client,
+                       org_id: str,
+                       per_page: Optional[int] = None,
+                       prefetch: int = 2,
+                       lazy: bool = False
+                       ) -> AsyncIterator['Ya360Group']:
+        model = Ya360LazyGroup if lazy else Ya360Group
+        async for response in client.iter_get(
+                url=Ya360Url.groups(org_id=org_id),
+                params=Ya360RequestParams(
+                    page=1,
+                    per_page=per_page if per_page is not None else client.page_size_for(Ya360Url.groups(org_id=org_id))
+                ),
+                prefetch=prefetch
+        ):
+            for group in response.get('groups'):
+                yield model.from_json(group)
 
     @staticmethod
     async def member_of_groups(client: AioYa360Client,
                                org_id: str,
-                               user_id: str) -> Optional[list['Ya360Group']]:
-        groups: list[Ya360Group] = await Ya360Group.from_api(client=client, org_id=org_id)
-        current_groups: list[str] = []
-        for group in groups:
-            if user_id in [member.id for member in group.members]:
-                current_groups.append(group.id)
-        return (
-            await Ya360Group.from_api(
-                client=client,
-                org_id=org_id,
-                group_ids=current_groups
-            )
+                               user_id: str,
+                               transitive: bool = False) -> Optional[list['Ya360Group']]:
+        index = await Ya360DirectoryIndex.attached_or_live(
+            client=client,
+            org_id=org_id,
+            users=transitive,
+            departments=transitive
         )
+        return index.groups_of(member_id=user_id, transitive=transitive)
+
+    @staticmethod
+    async def member_of_groups_many(client: AioYa360Client,
+                                    org_id: str,
+                                    user_ids: list[str],
+                                    transitive: bool = False) -> dict[str, list['Ya360Group']]:
+        index = await Ya360DirectoryIndex.attached_or_live(
+            client=client,
+            org_id=org_id,
+            users=transitive,
+            departments=transitive
+        )
+        return index.groups_of_many(member_ids=user_ids, transitive=transitive)
 
     @staticmethod
     async def create_group(client: AioYa360Client,
                            org_id: str,
                            params: Ya360GroupParams
                            ) -> Optional['Ya360Group']:
-        groups: list[Ya360Group] = await Ya360Group.from_api(client=client, org_id=org_id)
-        if params.label in [group.label for group in groups]:
+        index = await Ya360DirectoryIndex.attached_or_live(
+            client=client,
+            org_id=org_id,
+            users=False,
+            departments=False
+        )
+        if index.label_exists(params.label):
             raise Ya360Exception('Group already exists')
         try:
-            return Ya360Group.from_json(
+            group = Ya360Group.from_json(
                 await client.fetch_post(
                     url=Ya360Url.groups(
                         org_id=org_id,
@@ -114,17 +200,24 @@ class Ya360Group:
             )
         except Ya360Exception:
             return None
+        index.add_group(group)
+        return group
 
     @staticmethod
     async def delete_group(client: AioYa360Client,
                            org_id: str,
                            group_id: str) -> Optional[bool]:
         try:
-            return (await client.fetch_delete(
+            removed = (await client.fetch_delete(
                 url=Ya360Url.group(org_id=org_id, group_id=group_id)
             )).get('removed')
         except Ya360Exception:
             return False
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            if removed:
+                index.remove_group(group_id)
+        return removed
 
     @staticmethod
     async def edit_group(client: AioYa360Client,
@@ -133,7 +226,7 @@ class Ya360Group:
                          params: Ya360GroupParams
                          ) -> Optional['Ya360Group']:
         try:
-            return Ya360Group.from_json(
+            group = Ya360Group.from_json(
                 await client.fetch_patch(
                     url=Ya360Url.group(
                         org_id=org_id,
@@ -144,17 +237,25 @@ class Ya360Group:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_group(group)
+        return group
 
     @staticmethod
     async def delete_admins(client: AioYa360Client,
                             org_id: str,
                             group_id: str) -> Optional[bool]:
         try:
-            return (await client.fetch_delete(
+            removed = (await client.fetch_delete(
                 url=Ya360Url.group_admins(org_id=org_id, group_id=group_id)
             )).get('removed')
         except Ya360Exception:
             return False
+        index = client.directory_index(org_id=org_id)
+        if index is not None and removed:
+            index.clear_group_admins(group_id)
+        return removed
 
     @staticmethod
     async def edit_group_admins(client: AioYa360Client,
@@ -162,7 +263,7 @@ class Ya360Group:
                                 group_id: str,
                                 admins: list[str]) -> Optional['Ya360Group']:
         try:
-            return Ya360Group.from_json(
+            group = Ya360Group.from_json(
                 await client.fetch_put(
                     url=Ya360Url.group_admins(
                         org_id=org_id,
@@ -175,32 +276,42 @@ class Ya360Group:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_group(group)
+        return group
 
     @staticmethod
     async def group_members(client: AioYa360Client,
                             org_id: str,
                             group_id: str) -> Optional['Ya360ShortGroupMembers']:
         try:
-            return Ya360ShortGroupMembers.from_json(
-                (await client.fetch_get(
-                    url=Ya360Url.group_members(org_id=org_id, group_id=group_id)
-                ))[0]
+            responses = await client.fetch_get(
+                url=Ya360Url.group_members(org_id=org_id, group_id=group_id)
             )
         except Ya360Exception:
             return None
+        if not responses:
+            return None
+        return Ya360ShortGroupMembers.from_json(responses[0])
 
     @staticmethod
     async def delete_all_members(client: AioYa360Client,
                                  org_id: str,
                                  group_id: str) -> Optional[Ya360ShortGroupMembers]:
         try:
-            return Ya360ShortGroupMembers.from_json(
-                (await client.fetch_delete(
-                    url=Ya360Url.group_members(org_id=org_id, group_id=group_id)
-                ))[0]
+            response = await client.fetch_delete(
+                url=Ya360Url.group_members(org_id=org_id, group_id=group_id)
             )
         except Ya360Exception:
             return None
+        if not response:
+            return None
+        members = Ya360ShortGroupMembers.from_json(response)
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.set_group_members(group_id=group_id, members=[])
+        return members
 
     @staticmethod
     async def add_user_to_group(client: AioYa360Client,
@@ -208,12 +319,17 @@ class Ya360Group:
                                 group_id: str,
                                 user: Ya360GroupMember) -> Optional[bool]:
         try:
-            return (await client.fetch_post(
+            added = (await client.fetch_post(
                 url=Ya360Url.group_members(org_id=org_id, group_id=group_id),
                 params=user.to_json()
             ))['added']
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            if added:
+                index.add_group_member(group_id=group_id, member=user)
+        return added
 
     @staticmethod
     async def edit_group_members(client: AioYa360Client,
@@ -221,7 +337,7 @@ class Ya360Group:
                                  group_id: str,
                                  users: list[Ya360GroupMember]) -> Optional['Ya360ShortGroupMembers']:
         try:
-            return Ya360ShortGroupMembers.from_json(
+            members = Ya360ShortGroupMembers.from_json(
                 await client.fetch_put(
                     url=Ya360Url.group_members(org_id=org_id, group_id=group_id),
                     params={
@@ -231,6 +347,10 @@ class Ya360Group:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.set_group_members(group_id=group_id, members=users)
+        return members
 
     @staticmethod
     async def delete_group_member(client: AioYa360Client,
@@ -238,8 +358,113 @@ class Ya360Group:
                                   group_id: str,
                                   user: Ya360GroupMember) -> Optional[bool]:
         try:
-            return (await client.fetch_delete(
+            deleted = (await client.fetch_delete(
                 url=Ya360Url.group_member(org_id=org_id, group_id=group_id, type=user.type, id=user.id),
             ))['deleted']
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            if deleted:
+                index.remove_group_member(group_id=group_id, member=user)
+        return deleted
+
+    @staticmethod
+    def plan_group_members(group_id: str,
+                           current: list[Ya360GroupMember],
+                           desired: list[Ya360GroupMember],
+                           request_cost: int = 1024) -> Ya360GroupMembersPlan:
+        dumps = get_json_backend().dumps
+        current_keys = {(member.type, str(member.id)) for member in current}
+        desired_members = {(member.type, str(member.id)): member for member in desired}
+        to_add = [member for key, member in desired_members.items() if key not in current_keys]
+        to_remove = [member for member in current if (member.type, str(member.id)) not in desired_members]
+        replace_bytes = len(dumps({'members': [member.to_json() for member in desired_members.values()]}))
+        targeted_bytes = sum(len(dumps(member.to_json())) for member in to_add)
+        if not to_add and not to_remove:
+            strategy = 'noop'
+        elif request_cost + replace_bytes < (len(to_add) + len(to_remove)) * request_cost + targeted_bytes:
+            strategy = 'replace'
+        else:
+            strategy = 'targeted'
+        return Ya360GroupMembersPlan(
+            group_id=str(group_id),
+            desired=list(desired_members.values()),
+            to_add=to_add,
+            to_remove=to_remove,
+            strategy=strategy,
+            replace_bytes=replace_bytes,
+            targeted_bytes=targeted_bytes
+        )
+
+    @staticmethod
+    async def sync_group_members(client: AioYa360Client,
+                                 org_id: str,
+                                 group_id: str,
+                                 desired: list[Ya360GroupMember],
+                                 current: Optional[Ya360ShortGroupMembers] = None,
+                                 request_cost: int = 1024,
+                                 dry_run: bool = False) -> Optional[Ya360GroupMembersSyncResult]:
+        if current is None:
+            current = await Ya360Group.group_members(client=client, org_id=org_id, group_id=group_id)
+            if current is None:
+                return None
+        plan = Ya360Group.plan_group_members(
+            group_id=group_id,
+            current=current.to_members(),
+            desired=desired,
+            request_cost=request_cost
+        )
+        result = Ya360GroupMembersSyncResult(plan=plan)
+        if dry_run or plan.strategy == 'noop':
+            return result
+        if plan.strategy == 'replace':
+            replaced = await Ya360Group.edit_group_members(
+                client=client,
+                org_id=org_id,
+                group_id=group_id,
+                users=plan.desired
+            )
+            if replaced is None:
+                result.failed = [*plan.to_add, *plan.to_remove]
+            else:
+                result.replaced = True
+                result.added = list(plan.to_add)
+                result.removed = list(plan.to_remove)
+            return result
+        added, removed = await asyncio.gather(
+            asyncio.gather(*[
+                Ya360Group.add_user_to_group(client=client, org_id=org_id, group_id=group_id, user=member)
+                for member in plan.to_add
+            ]),
+            asyncio.gather(*[
+                Ya360Group.delete_group_member(client=client, org_id=org_id, group_id=group_id, user=member)
+                for member in plan.to_remove
+            ])
+        )
+        for member, done in zip(plan.to_add, added):
+            (result.added if done else result.failed).append(member)
+        for member, done in zip(plan.to_remove, removed):
+            (result.removed if done else result.failed).append(member)
+        return result
+
+
+class Ya360LazyGroup(Ya360LazyModel):
+    __slots__ = ()
+    model = Ya360Group
+
+    adminIds = Ya360RawField()
+    aliases = Ya360RawField()
+    authorId = Ya360RawField()
+    createdAt = Ya360RawField()
+    description = Ya360RawField()
+    email = Ya360RawField()
+    externalId = Ya360RawField()
+    id = Ya360RawField()
+    label = Ya360RawField()
+    memberOf = Ya360RawField()
+    members = Ya360NestedField(Ya360GroupMember.from_json, many=True)
+    membersCount = Ya360RawField()
+    name = Ya360RawField()
+    removed = Ya360RawField()
+    type = Ya360RawField()
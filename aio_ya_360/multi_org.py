@@ -0,0 +1,121 @@
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Union
+
+from . import AioYa360Client
+from .exceptions import Ya360Exception
+from .organizations import Ya360Organization
+
+Ya360TenantOperation = Callable[[AioYa360Client, str], Union[Awaitable[Any], AsyncIterator[Any]]]
+
+
+@dataclass
+class Ya360Tenant:
+    client: AioYa360Client
+    org_id: str
+    name: Optional[str] = None
+
+
+@dataclass
+class Ya360TenantResult:
+    tenant: Ya360Tenant
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def org_id(self) -> str:
+        return self.tenant.org_id
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Ya360MultiOrgExecutor:
+
+    def __init__(self,
+                 tenants: list[Ya360Tenant],
+                 max_concurrent_tenants: int = 8,
+                 per_tenant_buffer: int = 16):
+        self.tenants = tenants
+        self.max_concurrent_tenants = max_concurrent_tenants
+        self.per_tenant_buffer = per_tenant_buffer
+
+    @staticmethod
+    async def discover(clients: list[AioYa360Client],
+                       max_concurrent_tenants: int = 8,
+                       per_tenant_buffer: int = 16) -> 'Ya360MultiOrgExecutor':
+        organizations = await asyncio.gather(
+            *[Ya360Organization.from_api(client=client) for client in clients]
+        )
+        tenants = []
+        for client, client_organizations in zip(clients, organizations):
+            if client_organizations is None:
+                raise Ya360Exception(message='Ya360MultiOrgExecutor. Unable to list organizations of a client')
+            tenants.extend(
+                Ya360Tenant(client=client, org_id=str(organization.id), name=organization.name)
+                for organization in client_organizations
+            )
+        return Ya360MultiOrgExecutor(
+            tenants=tenants,
+            max_concurrent_tenants=max_concurrent_tenants,
+            per_tenant_buffer=per_tenant_buffer
+        )
+
+    async def _run_tenant(self,
+                          tenant: Ya360Tenant,
+                          operation: Ya360TenantOperation,
+                          queue: asyncio.Queue,
+                          tenant_slots: asyncio.Semaphore,
+                          buffer: asyncio.Semaphore):
+        async with tenant_slots:
+            try:
+                result = operation(tenant.client, tenant.org_id)
+                if inspect.isawaitable(result):
+                    await buffer.acquire()
+                    await queue.put((buffer, Ya360TenantResult(tenant=tenant, value=await result)))
+                else:
+                    async for value in result:
+                        await buffer.acquire()
+                        await queue.put((buffer, Ya360TenantResult(tenant=tenant, value=value)))
+            except Exception as error:
+                await buffer.acquire()
+                await queue.put((buffer, Ya360TenantResult(tenant=tenant, error=error)))
+
+    async def stream(self, operation: Ya360TenantOperation) -> AsyncIterator[Ya360TenantResult]:
+        queue: asyncio.Queue = asyncio.Queue()
+        tenant_slots = asyncio.Semaphore(self.max_concurrent_tenants)
+        tasks = [
+            asyncio.ensure_future(
+                self._run_tenant(
+                    tenant=tenant,
+                    operation=operation,
+                    queue=queue,
+                    tenant_slots=tenant_slots,
+                    buffer=asyncio.Semaphore(self.per_tenant_buffer)
+                )
+            ) for tenant in self.tenants
+        ]
+        done = asyncio.ensure_future(asyncio.gather(*tasks))
+        try:
+            while not (done.done() and queue.empty()):
+                if queue.empty():
+                    getter = asyncio.ensure_future(queue.get())
+                    await asyncio.wait([getter, done], return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        continue
+                    buffer, result = getter.result()
+                else:
+                    buffer, result = queue.get_nowait()
+                buffer.release()
+                yield result
+            done.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, done, return_exceptions=True)
+
+    async def gather(self, operation: Ya360TenantOperation) -> list[Ya360TenantResult]:
+        return [result async for result in self.stream(operation)]
@@ -1,13 +1,16 @@
 from dataclasses import dataclass
-from typing import Union, Optional
+from typing import TYPE_CHECKING, Optional, AsyncIterator
 
 from . import AioYa360Client
-from .base import Ya360RequestParams
 from .base import Ya360Url
+from .base.shared_classes import intern_str
 from .exceptions import Ya360Exception
 
+if TYPE_CHECKING:
+    from .store import Ya360SqliteDirectoryStore
 
-@dataclass
+
+@dataclass(slots=True)
 class Ya360Organization:
     id: str
     name: str
@@ -25,31 +28,61 @@ class Ya360Organization:
             email=data.get('email'),
             phone=data.get('phone'),
             fax=data.get('fax'),
-            language=data.get('language'),
-            subscriptionPlan=data.get('subscriptionPlan')
+            language=intern_str(data.get('language')),
+            subscriptionPlan=intern_str(data.get('subscriptionPlan'))
         )
 
     @staticmethod
-    async def from_api(client: AioYa360Client
+    async def from_api(client: AioYa360Client,
+                       page_size: int = 100,
+                       store: Optional['Ya360SqliteDirectoryStore'] = None
                        ) -> Optional[list['Ya360Organization']]:
+        if store is not None:
+            stored = await store.load_organizations()
+            if stored:
+                return stored
         await client.start()
+        organization_list = await client.coalesce(
+            key=('Ya360Organization.from_api', page_size, id(store)),
+            factory=lambda: Ya360Organization._list_from_api(client=client, page_size=page_size, store=store)
+        )
+        return list(organization_list) if organization_list is not None else None
+
+    @staticmethod
+    async def _list_from_api(client: AioYa360Client,
+                             page_size: int = 100,
+                             store: Optional['Ya360SqliteDirectoryStore'] = None
+                             ) -> Optional[list['Ya360Organization']]:
         organization_list = []
-        next_page_token = ''
-        while True:
-            try:
-                resp = await client.fetch_get(
-                    url=Ya360Url.organizations_list(),
-                    params=Ya360RequestParams(
-                        pageToken=next_page_token,
-                        pageSize=10
-                    )
-                )
-            except Ya360Exception:
-                return None
-            for response in resp:
-                for organization in response.get('organizations'):
-                    organization_list.append(Ya360Organization.from_json(organization))
-                next_page_token = response.get('nextPageToken')
-            if next_page_token == '':
-                break
+        try:
+            async for organization in Ya360Organization.iter_api(client=client, page_size=page_size):
+                organization_list.append(organization)
+        except Ya360Exception:
+            return None
+        if store is not None:
+            await store.save_organizations(organization_list)
         return organization_list
+
+    @staticmethod
+    async def iter_api(client: AioYa360Client,
+                       page_size: int = 100,
+                       store: Optional['Ya360SqliteDirectoryStore'] = None
+                       ) -> AsyncIterator['Ya360Organization']:
+        if store is not None:
+            stored = await store.load_organizations()
+            if stored:
+                for organization in stored:
+                    yield organization
+                return
+        await client.start()
+        organization_list = []
+        async for response in client.iter_cursor(
+                url=Ya360Url.organizations_list(),
+                page_size=page_size
+        ):
+            for organization in response.get('organizations') or []:
+                organization = Ya360Organization.from_json(organization)
+                organization_list.append(organization)
+                yield organization
+        if store is not None:
+            await store.save_organizations(organization_list)
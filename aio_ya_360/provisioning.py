@@ -0,0 +1,249 @@
+import asyncio
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from . import AioYa360Client
+from .base import Ya360Url, Ya360UserCreationParams, Ya360UserName
+from .base.files import atomic_write
+from .directory import Ya360DirectoryIndex
+from .exceptions import Ya360Exception
+from .users import Ya360User
+
+creation_fields = ('about', 'birthday', 'displayName', 'externalId', 'gender', 'language', 'position', 'timezone')
+boolean_fields = ('isAdmin', 'passwordChangeRequired')
+
+
+def read_rows(file_name: str, file_format: Optional[str] = None) -> Iterator[dict]:
+    file_format = file_format if file_format is not None else os.path.splitext(file_name)[1].lstrip('.').lower()
+    with open(file_name, newline='', encoding='utf-8') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+        elif file_format in ('jsonl', 'ndjson'):
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise Ya360Exception(message=f'Ya360UserProvisioner. Unsupported source format {file_format!r}')
+
+
+def _value(row: dict, name: str) -> Optional[Any]:
+    value = row.get(name)
+    if isinstance(value, str):
+        value = value.strip()
+    return value if value not in (None, '') else None
+
+
+def _boolean(value: Any) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y')
+
+
+def creation_params_from_row(row: dict) -> Ya360UserCreationParams:
+    name = row.get('name') if isinstance(row.get('name'), dict) else {
+        'first': _value(row, 'first'),
+        'last': _value(row, 'last'),
+        'middle': _value(row, 'middle'),
+    }
+    missing = [
+        column for column, value in (
+            ('nickname', _value(row, 'nickname')),
+            ('password', _value(row, 'password')),
+            ('departmentId', _value(row, 'departmentId')),
+            ('first', name.get('first')),
+            ('last', name.get('last')),
+        ) if value is None
+    ]
+    if missing:
+        raise Ya360Exception(message=f'Missing required columns: {", ".join(missing)}')
+    return Ya360UserCreationParams(
+        departmentId=_value(row, 'departmentId'),
+        name=Ya360UserName(first=name['first'], last=name['last'], middle=name.get('middle') or None),
+        nickname=_value(row, 'nickname'),
+        password=_value(row, 'password'),
+        **{column: _value(row, column) for column in creation_fields},
+        **{column: _boolean(_value(row, column)) for column in boolean_fields},
+    )
+
+
+@dataclass
+class Ya360ProvisioningResult:
+    row: int
+    nickname: Optional[str]
+    status: str
+    user_id: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_json(self) -> dict:
+        return {
+            'row': self.row,
+            'nickname': self.nickname,
+            'status': self.status,
+            'user_id': self.user_id,
+            'error': self.error,
+        }
+
+
+@dataclass
+class Ya360ProvisioningReport:
+    created: int = 0
+    invalid: int = 0
+    duplicate: int = 0
+    failed: int = 0
+    skipped: int = 0
+    failed_rows: list[int] = field(default_factory=list)
+
+    def add(self, result: Ya360ProvisioningResult):
+        setattr(self, result.status, getattr(self, result.status) + 1)
+        if result.status == 'failed':
+            self.failed_rows.append(result.row)
+
+
+class Ya360UserProvisioner:
+
+    def __init__(self,
+                 client: AioYa360Client,
+                 org_id: str,
+                 concurrency: int = 8,
+                 checkpoint_file: Optional[str] = None,
+                 results_file: Optional[str] = None,
+                 checkpoint_every: int = 50):
+        self.client = client
+        self.org_id = str(org_id)
+        self.concurrency = concurrency
+        self.checkpoint_file = checkpoint_file
+        self.results_file = results_file
+        self.checkpoint_every = checkpoint_every
+        self._completed_through = 0
+        self._done: set[int] = set()
+        self._reserved: set[str] = set()
+        self._since_checkpoint = 0
+        self._results: Optional[TextIO] = None
+
+    def _load_checkpoint(self):
+        if self.checkpoint_file is None or not os.path.exists(self.checkpoint_file):
+            return
+        with open(self.checkpoint_file) as checkpoint:
+            state = json.load(checkpoint)
+        self._completed_through = state.get('completed_through', 0)
+        self._done = set(state.get('done', []))
+
+    def _save_checkpoint(self):
+        if self.checkpoint_file is None:
+            return
+        while self._completed_through + 1 in self._done:
+            self._completed_through += 1
+            self._done.discard(self._completed_through)
+        atomic_write(
+            self.checkpoint_file,
+            json.dumps({'completed_through': self._completed_through, 'done': sorted(self._done)})
+        )
+        self._since_checkpoint = 0
+
+    def is_done(self, row: int) -> bool:
+        return row <= self._completed_through or row in self._done
+
+    def _record(self, result: Ya360ProvisioningResult, report: Ya360ProvisioningReport):
+        report.add(result)
+        if self._results is not None:
+            self._results.write(json.dumps(result.to_json(), ensure_ascii=False) + '\n')
+            self._results.flush()
+        if result.status != 'failed':
+            self._done.add(result.row)
+            self._since_checkpoint += 1
+            if self._since_checkpoint >= self.checkpoint_every:
+                self._save_checkpoint()
+
+    def _validate(self,
+                  row: int,
+                  data: dict,
+                  index: Ya360DirectoryIndex
+                  ) -> tuple[Optional[Ya360UserCreationParams], Optional[Ya360ProvisioningResult]]:
+        nickname = _value(data, 'nickname')
+        try:
+            params = creation_params_from_row(data)
+        except Ya360Exception as error:
+            return None, Ya360ProvisioningResult(row=row, nickname=nickname, status='invalid', error=error.message)
+        key = params.nickname.lower()
+        if key in self._reserved or index.nickname_exists(params.nickname):
+            return None, Ya360ProvisioningResult(
+                row=row,
+                nickname=params.nickname,
+                status='duplicate',
+                error=f'User with nickname {params.nickname} is already exists'
+            )
+        self._reserved.add(key)
+        return params, None
+
+    async def _create(self, row: int, params: Ya360UserCreationParams,
+                      index: Ya360DirectoryIndex) -> Ya360ProvisioningResult:
+        try:
+            user = Ya360User.from_json(
+                await self.client.fetch_post(
+                    url=Ya360Url.users(org_id=self.org_id),
+                    params=params.to_json()
+                )
+            )
+        except Exception as error:
+            self._reserved.discard(params.nickname.lower())
+            return Ya360ProvisioningResult(
+                row=row,
+                nickname=params.nickname,
+                status='failed',
+                error=error.message if isinstance(error, Ya360Exception) else repr(error)
+            )
+        index.add_user(user)
+        return Ya360ProvisioningResult(row=row, nickname=params.nickname, status='created', user_id=str(user.id))
+
+    async def _worker(self,
+                      queue: asyncio.Queue,
+                      index: Ya360DirectoryIndex,
+                      report: Ya360ProvisioningReport):
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                row, params = item
+                self._record(await self._create(row=row, params=params, index=index), report)
+            finally:
+                queue.task_done()
+
+    async def run_rows(self, rows: Iterable[dict]) -> Ya360ProvisioningReport:
+        self._load_checkpoint()
+        report = Ya360ProvisioningReport()
+        index = await Ya360DirectoryIndex.for_client(client=self.client, org_id=self.org_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        if self.results_file is not None:
+            self._results = open(self.results_file, 'a', encoding='utf-8')
+        workers = [
+            asyncio.ensure_future(self._worker(queue=queue, index=index, report=report))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            for row, data in enumerate(rows, start=1):
+                if self.is_done(row):
+                    report.skipped += 1
+                    continue
+                params, result = self._validate(row=row, data=data, index=index)
+                if result is not None:
+                    self._record(result, report)
+                else:
+                    await queue.put((row, params))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._save_checkpoint()
+            if self._results is not None:
+                self._results.close()
+                self._results = None
+        return report
+
+    async def run(self, file_name: str, file_format: Optional[str] = None) -> Ya360ProvisioningReport:
+        return await self.run_rows(read_rows(file_name=file_name, file_format=file_format))
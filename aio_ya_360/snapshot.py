@@ -0,0 +1,228 @@
+from array import array
+from collections import Counter
+from typing import Any, Hashable, Iterable, Optional
+
+from . import AioYa360Client
+from .base import Ya360Url
+from .directory import Ya360DirectoryIndex
+from .exceptions import Ya360Exception
+
+
+def mask_from_rows(rows: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def rows_of_mask(mask: int) -> list[int]:
+    rows = []
+    bits = bin(mask)[:1:-1]
+    row = bits.find('1')
+    while row != -1:
+        rows.append(row)
+        row = bits.find('1', row + 1)
+    return rows
+
+
+class Ya360DictionaryColumn:
+
+    def __init__(self):
+        self.values: list[Hashable] = []
+        self.codes = array('l')
+        self._lookup: dict[Hashable, int] = {}
+        self._masks: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def append(self, value: Hashable):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+        self._masks.clear()
+
+    def value_at(self, row: int) -> Hashable:
+        return self.values[self.codes[row]]
+
+    def mask(self, value: Hashable) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            return 0
+        mask = self._masks.get(code)
+        if mask is None:
+            mask = mask_from_rows(
+                (row for row, row_code in enumerate(self.codes) if row_code == code),
+                len(self.codes)
+            )
+            self._masks[code] = mask
+        return mask
+
+    def row_codes(self, mask: Optional[int] = None) -> Iterable[int]:
+        if mask is None:
+            return self.codes
+        codes = self.codes
+        return (codes[row] for row in rows_of_mask(mask))
+
+    def counts(self, mask: Optional[int] = None) -> dict[Hashable, int]:
+        values = self.values
+        return {values[code]: count for code, count in Counter(self.row_codes(mask)).items()}
+
+
+class Ya360DirectorySnapshot:
+    columns = ('departmentId', 'gender', 'language', 'timezone', 'position')
+    flags = ('isAdmin', 'isEnabled', 'isRobot', 'isDismissed')
+
+    def __init__(self, org_id: str, users: Iterable[Any] = ()):
+        self.org_id = org_id
+        self.user_ids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._columns = {column: Ya360DictionaryColumn() for column in self.columns}
+        self._flags: dict[str, int] = {}
+        self._group_members: dict[str, list[tuple[str, str]]] = {}
+        self._group_masks: dict[tuple[str, bool], int] = {}
+        self._department_parents: dict[str, Optional[str]] = {}
+        self._department_children: Optional[dict[Optional[str], list[str]]] = None
+        flag_rows: dict[str, list[int]] = {flag: [] for flag in self.flags}
+        for user in users:
+            row = len(self.user_ids)
+            user_id = str(user.id)
+            self.user_ids.append(user_id)
+            self._rows[user_id] = row
+            for column, values in self._columns.items():
+                value = getattr(user, column)
+                values.append(str(value) if column == 'departmentId' and value is not None else value)
+            for flag, rows in flag_rows.items():
+                if getattr(user, flag):
+                    rows.append(row)
+        for flag, rows in flag_rows.items():
+            self._flags[flag] = mask_from_rows(rows, len(self.user_ids))
+
+    @staticmethod
+    def from_index(index: Ya360DirectoryIndex) -> 'Ya360DirectorySnapshot':
+        snapshot = Ya360DirectorySnapshot(org_id=index.org_id, users=index.users.values())
+        for group_id, group in index.groups.items():
+            snapshot._group_members[group_id] = [
+                (member.type, str(member.id)) for member in group.members or []
+            ]
+        for department_id, department in index.departments.items():
+            snapshot._department_parents[department_id] = str(department.parentId) \
+                if department.parentId is not None else None
+        return snapshot
+
+    @staticmethod
+    async def from_api(client: AioYa360Client, org_id: str) -> 'Ya360DirectorySnapshot':
+        index = await Ya360DirectoryIndex.for_client(client=client, org_id=org_id)
+        return Ya360DirectorySnapshot.from_index(index)
+
+    async def load_2fa(self, client: AioYa360Client):
+        responses = await client.fetch_get_many(
+            urls=[Ya360Url.user_2fa(org_id=self.org_id, user_id=user_id) for user_id in self.user_ids]
+        )
+        rows: dict[str, list[int]] = {'has2fa': [], 'hasSecurityPhone': [], 'has2faKnown': []}
+        for row, response in enumerate(responses):
+            if isinstance(response, Ya360Exception) or response is None:
+                continue
+            rows['has2faKnown'].append(row)
+            if response.get('has2fa'):
+                rows['has2fa'].append(row)
+            if response.get('hasSecurityPhone'):
+                rows['hasSecurityPhone'].append(row)
+        for flag, flag_rows in rows.items():
+            self._flags[flag] = mask_from_rows(flag_rows, len(self.user_ids))
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @property
+    def all(self) -> int:
+        return (1 << len(self.user_ids)) - 1
+
+    def invert(self, mask: int) -> int:
+        return self.all ^ mask
+
+    def flag(self, name: str, value: bool = True) -> int:
+        if name not in self._flags:
+            raise Ya360Exception(message=f'Ya360DirectorySnapshot. Flag {name} is not loaded')
+        return self._flags[name] if value else self.invert(self._flags[name])
+
+    def where(self, column: str, value: Hashable) -> int:
+        return self._columns[column].mask(value)
+
+    def where_in(self, column: str, values: Iterable[Hashable]) -> int:
+        mask = 0
+        for value in values:
+            mask |= self._columns[column].mask(value)
+        return mask
+
+    def without_2fa(self) -> int:
+        return self.flag('has2faKnown') & self.flag('has2fa', value=False)
+
+    def _children(self) -> dict[Optional[str], list[str]]:
+        if self._department_children is None:
+            children: dict[Optional[str], list[str]] = {}
+            for child_id, parent_id in self._department_parents.items():
+                children.setdefault(parent_id, []).append(child_id)
+            self._department_children = children
+        return self._department_children
+
+    def _department_descendants(self, department_id: str) -> set[str]:
+        children = self._children()
+        found = {department_id}
+        stack = [department_id]
+        while stack:
+            for child_id in children.get(stack.pop(), []):
+                if child_id not in found:
+                    found.add(child_id)
+                    stack.append(child_id)
+        return found
+
+    def in_department(self, department_id: str, recursive: bool = False) -> int:
+        department_ids = self._department_descendants(str(department_id)) if recursive else {str(department_id)}
+        return self.where_in('departmentId', department_ids)
+
+    def in_group(self, group_id: str, transitive: bool = False) -> int:
+        key = (str(group_id), transitive)
+        mask = self._group_masks.get(key)
+        if mask is None:
+            mask = self._group_mask(group_id=str(group_id), transitive=transitive, seen=set())
+            self._group_masks[key] = mask
+        return mask
+
+    def _group_mask(self, group_id: str, transitive: bool, seen: set[str]) -> int:
+        seen.add(group_id)
+        user_rows = []
+        mask = 0
+        for member_type, member_id in self._group_members.get(group_id, []):
+            if member_type == 'user':
+                if member_id in self._rows:
+                    user_rows.append(self._rows[member_id])
+            elif not transitive:
+                continue
+            elif member_type == 'department':
+                mask |= self.in_department(member_id, recursive=True)
+            elif member_type == 'group' and member_id not in seen:
+                mask |= self._group_mask(group_id=member_id, transitive=True, seen=seen)
+        return mask | mask_from_rows(user_rows, len(self.user_ids))
+
+    def count(self, mask: int) -> int:
+        return mask.bit_count()
+
+    def ids(self, mask: int) -> list[str]:
+        return [self.user_ids[row] for row in rows_of_mask(mask)]
+
+    def count_by(self, column: str, mask: Optional[int] = None) -> dict[Hashable, int]:
+        return self._columns[column].counts(mask)
+
+    def group_by(self, column: str, mask: Optional[int] = None) -> dict[Hashable, list[str]]:
+        column_values = self._columns[column]
+        values = column_values.values
+        codes = column_values.codes
+        groups: dict[Hashable, list[str]] = {}
+        rows = range(len(self.user_ids)) if mask is None else rows_of_mask(mask)
+        for row in rows:
+            groups.setdefault(values[codes[row]], []).append(self.user_ids[row])
+        return groups
@@ -0,0 +1,235 @@
+import asyncio
+import dataclasses
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .base.json_backend import Ya360JsonBackend, get_json_backend
+from .departments import Ya360Department
+from .directory import Ya360DirectoryIndex
+from .groups import Ya360Group, Ya360LazyGroup
+from .organizations import Ya360Organization
+from .users import Ya360User, Ya360LazyUser
+
+if TYPE_CHECKING:
+    from .sync import Ya360DirectoryDelta, Ya360DirectorySync
+
+
+class Ya360SqliteDirectoryStore:
+    schema = '''
+        CREATE TABLE IF NOT EXISTS users (
+            org_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            nickname TEXT,
+            email TEXT,
+            department_id TEXT,
+            updated_at TEXT,
+            hash BLOB NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (org_id, id)
+        );
+        CREATE INDEX IF NOT EXISTS users_nickname ON users (org_id, nickname COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS users_email ON users (org_id, email COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS users_department_id ON users (org_id, department_id);
+        CREATE TABLE IF NOT EXISTS groups (
+            org_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            label TEXT,
+            email TEXT,
+            hash BLOB NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (org_id, id)
+        );
+        CREATE INDEX IF NOT EXISTS groups_label ON groups (org_id, label COLLATE NOCASE);
+        CREATE TABLE IF NOT EXISTS departments (
+            org_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            label TEXT,
+            parent_id TEXT,
+            hash BLOB NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (org_id, id)
+        );
+        CREATE INDEX IF NOT EXISTS departments_parent_id ON departments (org_id, parent_id);
+        CREATE TABLE IF NOT EXISTS organizations (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sync_state (
+            org_id TEXT PRIMARY KEY,
+            watermark TEXT,
+            synced_at REAL NOT NULL
+        );
+    '''
+
+    def __init__(self, file_name: str, json_backend: Optional[Ya360JsonBackend] = None):
+        self.file_name = file_name
+        self.json_backend = json_backend if json_backend is not None else get_json_backend()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.file_name, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(self.schema)
+            self._connection = connection
+        return self._connection
+
+    def _locked(self, function: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return function(connection, *args)
+
+    async def _run(self, function: Callable[..., Any], *args) -> Any:
+        return await asyncio.to_thread(self._locked, function, *args)
+
+    async def close(self):
+        def close():
+            with self._lock:
+                if self._connection is not None:
+                    self._connection.close()
+                    self._connection = None
+        await asyncio.to_thread(close)
+
+    def _user_row(self, org_id: str, user: Any, content_hash: bytes, data: dict) -> tuple:
+        return (org_id, str(user.id), user.nickname, user.email,
+                str(user.departmentId) if user.departmentId is not None else None,
+                user.updatedAt, content_hash, self.json_backend.dumps(data))
+
+    def _group_row(self, org_id: str, group: Any, content_hash: bytes, data: dict) -> tuple:
+        return (org_id, str(group.id), group.label, group.email, content_hash, self.json_backend.dumps(data))
+
+    def _department_row(self, org_id: str, department: Any, content_hash: bytes, data: dict) -> tuple:
+        return (org_id, str(department.id), department.label,
+                str(department.parentId) if department.parentId is not None else None,
+                content_hash, self.json_backend.dumps(data))
+
+    async def save(self, sync: 'Ya360DirectorySync', delta: 'Ya360DirectoryDelta'):
+        org_id = delta.org_id
+        statements = []
+        for table, resource_delta, row, placeholders in (
+                ('users', delta.users, self._user_row, 8),
+                ('groups', delta.groups, self._group_row, 6),
+                ('departments', delta.departments, self._department_row, 6),
+        ):
+            hashes = sync.hashes[table]
+            rows = [
+                row(org_id, item, hashes[str(item.id)], resource_delta.raw[str(item.id)])
+                for item in (*resource_delta.added, *resource_delta.changed)
+            ]
+            statements.append((
+                f'DELETE FROM {table} WHERE org_id = ? AND id = ?',
+                [(org_id, item_id) for item_id in resource_delta.removed]
+            ))
+            statements.append((
+                f'INSERT OR REPLACE INTO {table} VALUES ({", ".join("?" * placeholders)})',
+                rows
+            ))
+
+        def save(connection: sqlite3.Connection):
+            for statement, rows in statements:
+                if rows:
+                    connection.executemany(statement, rows)
+            connection.execute(
+                'INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)',
+                (org_id, delta.watermark, time.time())
+            )
+        await self._run(save)
+
+    async def synced_at(self, org_id: str) -> Optional[float]:
+        def synced_at(connection: sqlite3.Connection) -> Optional[float]:
+            row = connection.execute('SELECT synced_at FROM sync_state WHERE org_id = ?', (str(org_id),)).fetchone()
+            return row[0] if row is not None else None
+        return await self._run(synced_at)
+
+    async def restore(self, sync: 'Ya360DirectorySync') -> bool:
+        org_id = sync.org_id
+        loads = self.json_backend.loads
+
+        def load(connection: sqlite3.Connection) -> Optional[tuple]:
+            state = connection.execute('SELECT watermark FROM sync_state WHERE org_id = ?', (org_id,)).fetchone()
+            if state is None:
+                return None
+            users = connection.execute(
+                'SELECT id, updated_at, hash, data FROM users WHERE org_id = ?', (org_id,)
+            ).fetchall()
+            groups = connection.execute('SELECT id, hash, data FROM groups WHERE org_id = ?', (org_id,)).fetchall()
+            departments = connection.execute(
+                'SELECT id, hash, data FROM departments WHERE org_id = ?', (org_id,)
+            ).fetchall()
+            index = Ya360DirectoryIndex(
+                org_id=org_id,
+                users=[Ya360LazyUser(loads(data)) for _, _, _, data in users],
+                groups=[Ya360LazyGroup(loads(data)) for _, _, data in groups],
+                departments=[Ya360Department.from_json(loads(data)) for _, _, data in departments],
+            )
+            hashes = {
+                'users': {user_id: content_hash for user_id, _, content_hash, _ in users},
+                'groups': {group_id: content_hash for group_id, content_hash, _ in groups},
+                'departments': {department_id: content_hash for department_id, content_hash, _ in departments},
+            }
+            updated_at = {user_id: updated_at for user_id, updated_at, _, _ in users if updated_at is not None}
+            return state[0], hashes, updated_at, index
+
+        loaded = await self._run(load)
+        if loaded is None:
+            return False
+        watermark, sync.hashes, sync.updated_at, index = loaded
+        sync.watermark = watermark
+        sync.index = index
+        sync.client.attach_directory_index(index)
+        return True
+
+    async def _select_users(self, where: str, args: tuple) -> list[Ya360User]:
+        def select(connection: sqlite3.Connection) -> list[str]:
+            return [row[0] for row in connection.execute(f'SELECT data FROM users WHERE {where}', args)]
+        return [Ya360User.from_json(self.json_backend.loads(data)) for data in await self._run(select)]
+
+    async def user_by_id(self, org_id: str, user_id: str) -> Optional[Ya360User]:
+        users = await self._select_users('org_id = ? AND id = ?', (str(org_id), str(user_id)))
+        return users[0] if users else None
+
+    async def user_by_nickname(self, org_id: str, nickname: str) -> Optional[Ya360User]:
+        users = await self._select_users('org_id = ? AND nickname = ? COLLATE NOCASE', (str(org_id), nickname))
+        return users[0] if users else None
+
+    async def user_by_email(self, org_id: str, email: str) -> Optional[Ya360User]:
+        users = await self._select_users('org_id = ? AND email = ? COLLATE NOCASE', (str(org_id), email))
+        return users[0] if users else None
+
+    async def users_in_department(self, org_id: str, department_id: str) -> list[Ya360User]:
+        return await self._select_users('org_id = ? AND department_id = ?', (str(org_id), str(department_id)))
+
+    async def group_by_label(self, org_id: str, label: str) -> Optional[Ya360Group]:
+        def select(connection: sqlite3.Connection) -> Optional[tuple]:
+            return connection.execute(
+                'SELECT data FROM groups WHERE org_id = ? AND label = ? COLLATE NOCASE', (str(org_id), label)
+            ).fetchone()
+        row = await self._run(select)
+        return Ya360Group.from_json(self.json_backend.loads(row[0])) if row is not None else None
+
+    async def save_organizations(self, organizations: list[Ya360Organization]):
+        rows = [
+            (str(organization.id), organization.name, self.json_backend.dumps(dataclasses.asdict(organization)))
+            for organization in organizations
+        ]
+
+        def save(connection: sqlite3.Connection):
+            connection.execute('DELETE FROM organizations')
+            connection.executemany('INSERT INTO organizations VALUES (?, ?, ?)', rows)
+        await self._run(save)
+
+    async def load_organizations(self) -> list[Ya360Organization]:
+        loads = self.json_backend.loads
+
+        def load(connection: sqlite3.Connection) -> list[Ya360Organization]:
+            return [
+                Ya360Organization.from_json(loads(row[0]))
+                for row in connection.execute('SELECT data FROM organizations ORDER BY rowid')
+            ]
+        return await self._run(load)
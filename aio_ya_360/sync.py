@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from loguru import logger
+
+from . import AioYa360Client
+from .base import Ya360Url, Ya360RequestParams
+from .departments import Ya360Department
+from .directory import Ya360DirectoryIndex
+from .groups import Ya360Group
+from .users import Ya360User
+
+if TYPE_CHECKING:
+    from .store import Ya360SqliteDirectoryStore
+    from .watch import Ya360DirectoryWatcher
+
+
+@dataclass
+class Ya360SyncDelta:
+    resource: str
+    added: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    previous: dict = field(default_factory=dict)
+    raw: dict = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+
+@dataclass
+class Ya360DirectoryDelta:
+    org_id: str
+    users: Ya360SyncDelta
+    groups: Ya360SyncDelta
+    departments: Ya360SyncDelta
+    watermark: Optional[str] = None
+    scanned: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return self.users.empty and self.groups.empty and self.departments.empty
+
+
+@dataclass
+class Ya360SyncResource:
+    name: str
+    url: Callable[[str], str]
+    from_json: Callable[[dict], Any]
+    items: Callable[[Ya360DirectoryIndex], dict]
+    add: Callable[[Ya360DirectoryIndex, Any], None]
+    remove: Callable[[Ya360DirectoryIndex, str], Any]
+
+
+class Ya360DirectorySync:
+    resources = (
+        Ya360SyncResource(
+            name='users',
+            url=lambda org_id: Ya360Url.users(org_id=org_id),
+            from_json=Ya360User.from_json,
+            items=lambda index: index.users,
+            add=Ya360DirectoryIndex.add_user,
+            remove=Ya360DirectoryIndex.remove_user,
+        ),
+        Ya360SyncResource(
+            name='groups',
+            url=lambda org_id: Ya360Url.groups(org_id=org_id),
+            from_json=Ya360Group.from_json,
+            items=lambda index: index.groups,
+            add=Ya360DirectoryIndex.add_group,
+            remove=Ya360DirectoryIndex.remove_group,
+        ),
+        Ya360SyncResource(
+            name='departments',
+            url=lambda org_id: Ya360Url.departments(org_id=org_id),
+            from_json=Ya360Department.from_json,
+            items=lambda index: index.departments,
+            add=Ya360DirectoryIndex.add_department,
+            remove=Ya360DirectoryIndex.remove_department,
+        ),
+    )
+
+    def __init__(self,
+                 client: AioYa360Client,
+                 org_id: str,
+                 index: Optional[Ya360DirectoryIndex] = None,
+                 prefetch: int = 2,
+                 trust_updated_at: bool = False,
+                 store: Optional['Ya360SqliteDirectoryStore'] = None):
+        self.client = client
+        self.org_id = str(org_id)
+        self.index = index if index is not None else client.directory_index(org_id=self.org_id)
+        self.prefetch = prefetch
+        self.trust_updated_at = trust_updated_at
+        self.store = store
+        self.watermark: Optional[str] = None
+        self.hashes: dict[str, dict[str, bytes]] = {resource.name: {} for resource in self.resources}
+        self.updated_at: dict[str, str] = {}
+        self._lock = asyncio.Lock()
+        self._revalidate_task: Optional[asyncio.Task] = None
+
+    def content_hash(self, data: dict) -> bytes:
+        return hashlib.blake2b(self.client.json_backend.dumps(data).encode('utf-8'), digest_size=16).digest()
+
+    def _unchanged_user(self, user_id: str, data: dict) -> bool:
+        updated_at = data.get('updatedAt')
+        return updated_at is not None and self.updated_at.get(user_id) == updated_at \
+            and user_id in self.hashes['users']
+
+    async def _scan(self, resource: Ya360SyncResource) -> tuple[Ya360SyncDelta, dict[str, bytes], int]:
+        delta = Ya360SyncDelta(resource=resource.name)
+        known = self.hashes[resource.name]
+        hashes: dict[str, bytes] = {}
+        scanned = 0
+        url = resource.url(self.org_id)
+        async for response in self.client.iter_get(
+                url=url,
+                params=Ya360RequestParams(page=1, per_page=self.client.page_size_for(url)),
+                prefetch=self.prefetch
+        ):
+            for data in response.get(resource.name) or []:
+                scanned += 1
+                item_id = str(data.get('id'))
+                if resource.name == 'users' and self.trust_updated_at and self._unchanged_user(item_id, data):
+                    hashes[item_id] = known[item_id]
+                    continue
+                content_hash = self.content_hash(data)
+                hashes[item_id] = content_hash
+                previous = known.get(item_id)
+                if previous == content_hash:
+                    continue
+                if previous is None:
+                    delta.added.append(resource.from_json(data))
+                else:
+                    delta.changed.append(resource.from_json(data))
+                delta.raw[item_id] = data
+        delta.removed = [item_id for item_id in known if item_id not in hashes]
+        return delta, hashes, scanned
+
+    def _apply(self, resource: Ya360SyncResource, delta: Ya360SyncDelta):
+        items = resource.items(self.index)
+        for item_id in delta.removed:
+            previous = resource.remove(self.index, item_id)
+            if previous is not None:
+                delta.previous[item_id] = previous
+        for item in delta.changed:
+            previous = items.get(str(item.id))
+            if previous is not None:
+                delta.previous[str(item.id)] = previous
+        for item in (*delta.added, *delta.changed):
+            resource.add(self.index, item)
+
+    async def sync(self) -> Ya360DirectoryDelta:
+        async with self._lock:
+            tasks = [asyncio.ensure_future(self._scan(resource)) for resource in self.resources]
+            try:
+                scans = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            self.hashes = {resource.name: hashes for resource, (_, hashes, _) in zip(self.resources, scans)}
+            if self.index is None:
+                self.index = Ya360DirectoryIndex(org_id=self.org_id)
+                self.client.attach_directory_index(self.index)
+            for resource, (delta, _, _) in zip(self.resources, scans):
+                self._apply(resource=resource, delta=delta)
+            users_delta = scans[0][0]
+            for user in (*users_delta.added, *users_delta.changed):
+                if user.updatedAt is not None:
+                    self.updated_at[str(user.id)] = user.updatedAt
+                    if self.watermark is None or user.updatedAt > self.watermark:
+                        self.watermark = user.updatedAt
+            for user_id in users_delta.removed:
+                self.updated_at.pop(user_id, None)
+            delta = Ya360DirectoryDelta(
+                org_id=self.org_id,
+                users=scans[0][0],
+                groups=scans[1][0],
+                departments=scans[2][0],
+                watermark=self.watermark,
+                scanned=sum(scanned for _, _, scanned in scans),
+            )
+            if self.store is not None:
+                await self.store.save(sync=self, delta=delta)
+            return delta
+
+    async def warm_start(self, revalidate: bool = True) -> Ya360DirectoryIndex:
+        if self.store is None or not await self.store.restore(sync=self):
+            await self.sync()
+        elif revalidate:
+            self._revalidate_task = asyncio.ensure_future(self.sync())
+            self._revalidate_task.add_done_callback(self._log_revalidation)
+        return self.index
+
+    def _log_revalidation(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f'Ya360DirectorySync. Revalidation of organization {self.org_id} failed: {task.exception()!r}')
+
+    async def revalidated(self) -> Optional[Ya360DirectoryDelta]:
+        if self._revalidate_task is None:
+            return None
+        return await self._revalidate_task
+
+    def watch(self,
+              interval: float = 60.0,
+              min_interval: float = 5.0,
+              max_interval: float = 600.0,
+              initial_events: bool = False) -> 'Ya360DirectoryWatcher':
+        from .watch import Ya360DirectoryWatcher
+        return Ya360DirectoryWatcher(
+            sync=self,
+            interval=interval,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            initial_events=initial_events
+        )
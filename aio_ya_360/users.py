@@ -1,12 +1,15 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, AsyncIterator
 
 from .base import AioYa360Client, Ya360UserContact, Ya360UserName, Ya360Url, Ya360RequestParams, Ya360UserRequestParams, \
     Ya360UserContactParams, Ya360UserCreationParams, Ya360User2fa
+from .base.lazy import Ya360LazyModel, Ya360RawField, Ya360NestedField
+from .base.shared_classes import interned_strings
+from .directory import Ya360DirectoryIndex
 from .exceptions import Ya360Exception
 
 
-@dataclass
+@dataclass(slots=True)
 class Ya360User:
     about: str
     aliases: list[str]
@@ -33,63 +36,104 @@ class Ya360User:
 
     @staticmethod
     def from_json(data: dict) -> 'Ya360User':
+        get = data.get
+        intern = interned_strings.setdefault
+        gender = get('gender')
+        language = get('language')
+        timezone = get('timezone')
         return Ya360User(
-            about=data.get('about'),
-            aliases=data.get('aliases'),
-            avatarId=data.get('avatarId'),
-            birthday=data.get('birthday'),
-            contacts=[Ya360UserContact.from_json(contact) for contact in data.get('contacts')],
-            createdAt=data.get('createdAt'),
-            departmentId=data.get('departmentID'),
-            email=data.get('email'),
-            externalId=data.get('externalId'),
-            gender=data.get('gender'),
-            groups=data.get('groups'),
-            id=data.get('id'),
-            isAdmin=data.get('isAdmin'),
-            isDismissed=data.get('isDismissed'),
-            isEnabled=data.get('isEnabled'),
-            isRobot=data.get('isRobot'),
-            language=data.get('language'),
-            name=Ya360UserName.from_json(data.get('name')),
-            nickname=data.get('nickname'),
-            position=data.get('position'),
-            timezone=data.get('timezone'),
-            updatedAt=data.get('updatedAt'),
+            get('about'),
+            get('aliases'),
+            get('avatarId'),
+            get('birthday'),
+            [Ya360UserContact.from_json(contact) for contact in get('contacts')],
+            get('createdAt'),
+            get('departmentID'),
+            get('email'),
+            get('externalId'),
+            intern(gender, gender),
+            get('groups'),
+            get('id'),
+            get('isAdmin'),
+            get('isDismissed'),
+            get('isEnabled'),
+            get('isRobot'),
+            intern(language, language),
+            Ya360UserName.from_json(get('name')),
+            get('nickname'),
+            get('position'),
+            intern(timezone, timezone),
+            get('updatedAt'),
         )
 
     @staticmethod
     async def from_api(client: AioYa360Client,
                        org_id: str,
-                       user_ids: Optional[list[str]] = None
-                       ) -> Optional[list['Ya360User']]:
+                       user_ids: Optional[list[str]] = None,
+                       per_page: Optional[int] = None,
+                       lazy: bool = False
+                       ) -> Optional[list[Optional['Ya360User']]]:
+        model = Ya360LazyUser if lazy else Ya360User
         if user_ids is not None:
             return [
-                Ya360User.from_json(
-                    (await client.fetch_get(
-                        url=Ya360Url.user(
+                model.from_json(response) if not isinstance(response, Ya360Exception) else None
+                for response in await client.fetch_get_many(
+                    urls=[
+                        Ya360Url.user(
                             org_id=org_id,
                             user_id=user_id
-                        ),
-                    ))[0]
-                ) for user_id in user_ids
+                        ) for user_id in user_ids
+                    ]
+                )
             ]
         else:
-            users_list = []
-            try:
-                resp = await client.fetch_get(
-                    url=Ya360Url.users(org_id=org_id),
-                    params=Ya360RequestParams(
-                        page=0,
-                        per_page=10
-                    )
+            users_list = await client.coalesce(
+                key=('Ya360User.from_api', org_id, per_page, lazy, client.generation(Ya360Url.users(org_id=org_id))),
+                factory=lambda: Ya360User._list_from_api(client=client, org_id=org_id, per_page=per_page, lazy=lazy)
+            )
+            return list(users_list) if users_list is not None else None
+
+    @staticmethod
+    async def _list_from_api(client: AioYa360Client,
+                             org_id: str,
+                             per_page: Optional[int] = None,
+                             lazy: bool = False
+                             ) -> Optional[list['Ya360User']]:
+        model = Ya360LazyUser if lazy else Ya360User
+        users_list = []
+        try:
+            resp = await client.fetch_get(
+                url=Ya360Url.users(org_id=org_id),
+                params=Ya360RequestParams(
+                    page=1,
+                    per_page=per_page if per_page is not None else client.page_size_for(Ya360Url.users(org_id=org_id))
                 )
-            except Ya360Exception:
-                return None
-            for response in resp:
-                for user in response.get('users'):
-                    users_list.append(Ya360User.from_json(user))
-            return users_list
+            )
+        except Ya360Exception:
+            return None
+        for response in resp:
+            for user in response.get('users'):
+                users_list.append(model.from_json(user))
+        return users_list
+
+    @staticmethod
+    async def iter_api(client: AioYa360Client,
+                       org_id: str,
+                       per_page: Optional[int] = None,
+                       prefetch: int = 2,
+                       lazy: bool = False
+                       ) -> AsyncIterator['Ya360User']:
+        model = Ya360LazyUser if lazy else Ya360User
+        async for response in client.iter_get(
+                url=Ya360Url.users(org_id=org_id),
+                params=Ya360RequestParams(
+                    page=1,
+                    per_page=per_page if per_page is not None else client.page_size_for(Ya360Url.users(org_id=org_id))
+                ),
+                prefetch=prefetch
+        ):
+            for user in response.get('users'):
+                yield model.from_json(user)
 
     @staticmethod
     async def edit_info(client: AioYa360Client,
@@ -98,7 +142,7 @@ class Ya360User:
                         params: Ya360UserRequestParams
                         ) -> Optional['Ya360User']:
         try:
-            return Ya360User.from_json(
+            user = Ya360User.from_json(
                 await client.fetch_patch(
                     url=Ya360Url.user(org_id=org_id, user_id=user_id),
                     params=params.to_json()
@@ -106,6 +150,10 @@ class Ya360User:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_user(user)
+        return user
 
     @staticmethod
     async def edit_user_contacts(client: AioYa360Client,
@@ -114,7 +162,7 @@ class Ya360User:
                                  contacts: list[Ya360UserContactParams]
                                  ) -> Optional['Ya360User']:
         try:
-            return Ya360User.from_json(
+            user = Ya360User.from_json(
                 await client.fetch_put(
                     url=Ya360Url.user_contacts(org_id=org_id, user_id=user_id),
                     params={
@@ -126,6 +174,10 @@ class Ya360User:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_user(user)
+        return user
 
     @staticmethod
     async def delete_user_contacts(client: AioYa360Client,
@@ -138,6 +190,9 @@ class Ya360User:
             )
         except Ya360Exception:
             return False
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.clear_user_contacts(user_id)
         return True
 
     @staticmethod
@@ -145,17 +200,18 @@ class Ya360User:
                        org_id: str,
                        params: Ya360UserCreationParams
                        ) -> Optional['Ya360User']:
-        if params.nickname in [
-            user.nickname for user in await Ya360User.from_api(
-                client=client,
-                org_id=org_id
-            )
-        ]:
+        index = await Ya360DirectoryIndex.attached_or_live(
+            client=client,
+            org_id=org_id,
+            groups=False,
+            departments=False
+        )
+        if index.nickname_exists(params.nickname):
             raise Ya360Exception(
                 message=f'User with nickname {params.nickname} is already exists'
             )
         try:
-            return Ya360User.from_json(
+            user = Ya360User.from_json(
                 await client.fetch_post(
                     url=Ya360Url.users(org_id=org_id),
                     params=params.to_json()
@@ -163,6 +219,8 @@ class Ya360User:
             )
         except Ya360Exception:
             return None
+        index.add_user(user)
+        return user
 
     @staticmethod
     async def user_2fa_status(client: AioYa360Client, org_id: str, user_id: str) -> Ya360User2fa:
@@ -188,7 +246,7 @@ class Ya360User:
                              user_id: str,
                              alias: str) -> Optional['Ya360User']:
         try:
-            return Ya360User.from_json(
+            user = Ya360User.from_json(
                 await client.fetch_post(
                     url=Ya360Url.user_aliases(org_id=org_id, user_id=user_id),
                     params={
@@ -198,6 +256,10 @@ class Ya360User:
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.add_user_alias(user_id=user_id, alias=alias)
+        return user
 
     @staticmethod
     async def user_delete_alias(client: AioYa360Client,
@@ -205,10 +267,42 @@ class Ya360User:
                                 user_id: str,
                                 alias: str) -> Optional['Ya360User']:
         try:
-            return Ya360User.from_json(
+            user = Ya360User.from_json(
                 await client.fetch_delete(
                     url=Ya360Url.user_aliases(org_id=org_id, user_id=user_id, alias=alias)
                 )
             )
         except Ya360Exception:
             return None
+        index = client.directory_index(org_id=org_id)
+        if index is not None:
+            index.remove_user_alias(user_id=user_id, alias=alias)
+        return user
+
+
+class Ya360LazyUser(Ya360LazyModel):
+    __slots__ = ()
+    model = Ya360User
+
+    about = Ya360RawField()
+    aliases = Ya360RawField()
+    avatarId = Ya360RawField()
+    birthday = Ya360RawField()
+    contacts = Ya360NestedField(Ya360UserContact.from_json, many=True)
+    createdAt = Ya360RawField()
+    departmentId = Ya360RawField('departmentID')
+    email = Ya360RawField()
+    externalId = Ya360RawField()
+    gender = Ya360RawField()
+    groups = Ya360RawField()
+    id = Ya360RawField()
+    isAdmin = Ya360RawField()
+    isDismissed = Ya360RawField()
+    isEnabled = Ya360RawField()
+    isRobot = Ya360RawField()
+    language = Ya360RawField()
+    name = Ya360NestedField(Ya360UserName.from_json)
+    nickname = Ya360RawField()
+    position = Ya360RawField()
+    timezone = Ya360RawField()
+    updatedAt = Ya360RawField()
@@ -0,0 +1,228 @@
+import asyncio
+from dataclasses import dataclass, fields
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from loguru import logger
+
+from .base import Ya360GroupMember
+from .departments import Ya360Department
+from .exceptions import Ya360Exception
+from .groups import Ya360Group
+from .sync import Ya360DirectoryDelta, Ya360DirectorySync, Ya360SyncDelta
+from .users import Ya360User
+
+
+@dataclass
+class Ya360DirectoryEvent:
+    org_id: str
+
+
+@dataclass
+class Ya360UserCreated(Ya360DirectoryEvent):
+    user: Ya360User
+
+
+@dataclass
+class Ya360UserUpdated(Ya360DirectoryEvent):
+    user: Ya360User
+    previous: Ya360User
+    fields: tuple[str, ...]
+
+
+@dataclass
+class Ya360UserRemoved(Ya360DirectoryEvent):
+    user_id: str
+    previous: Optional[Ya360User] = None
+
+
+@dataclass
+class Ya360UserDismissed(Ya360DirectoryEvent):
+    user: Ya360User
+
+
+@dataclass
+class Ya360UserAliasAdded(Ya360DirectoryEvent):
+    user: Ya360User
+    alias: str
+
+
+@dataclass
+class Ya360UserAliasRemoved(Ya360DirectoryEvent):
+    user: Ya360User
+    alias: str
+
+
+@dataclass
+class Ya360GroupCreated(Ya360DirectoryEvent):
+    group: Ya360Group
+
+
+@dataclass
+class Ya360GroupUpdated(Ya360DirectoryEvent):
+    group: Ya360Group
+    previous: Ya360Group
+    fields: tuple[str, ...]
+
+
+@dataclass
+class Ya360GroupRemoved(Ya360DirectoryEvent):
+    group_id: str
+    previous: Optional[Ya360Group] = None
+
+
+@dataclass
+class Ya360MemberAdded(Ya360DirectoryEvent):
+    group: Ya360Group
+    member: Ya360GroupMember
+
+
+@dataclass
+class Ya360MemberRemoved(Ya360DirectoryEvent):
+    group: Ya360Group
+    member: Ya360GroupMember
+
+
+@dataclass
+class Ya360DepartmentCreated(Ya360DirectoryEvent):
+    department: Ya360Department
+
+
+@dataclass
+class Ya360DepartmentUpdated(Ya360DirectoryEvent):
+    department: Ya360Department
+    previous: Ya360Department
+    fields: tuple[str, ...]
+
+
+@dataclass
+class Ya360DepartmentRemoved(Ya360DirectoryEvent):
+    department_id: str
+    previous: Optional[Ya360Department] = None
+
+
+def changed_fields(previous: Any, current: Any) -> tuple[str, ...]:
+    return tuple(
+        field.name for field in fields(current)
+        if getattr(previous, field.name) != getattr(current, field.name)
+    )
+
+
+def _member_keys(group: Ya360Group) -> dict[tuple[str, str], Ya360GroupMember]:
+    return {(member.type, str(member.id)): member for member in group.members or []}
+
+
+def user_events(org_id: str, delta: Ya360SyncDelta) -> Iterator[Ya360DirectoryEvent]:
+    for user in delta.added:
+        yield Ya360UserCreated(org_id=org_id, user=user)
+    for user in delta.changed:
+        previous = delta.previous.get(str(user.id))
+        if previous is None:
+            yield Ya360UserCreated(org_id=org_id, user=user)
+            continue
+        changed = changed_fields(previous, user)
+        if not changed:
+            continue
+        yield Ya360UserUpdated(org_id=org_id, user=user, previous=previous, fields=changed)
+        if 'isDismissed' in changed and user.isDismissed and not previous.isDismissed:
+            yield Ya360UserDismissed(org_id=org_id, user=user)
+        if 'aliases' in changed:
+            previous_aliases = set(previous.aliases or [])
+            aliases = set(user.aliases or [])
+            for alias in sorted(aliases - previous_aliases):
+                yield Ya360UserAliasAdded(org_id=org_id, user=user, alias=alias)
+            for alias in sorted(previous_aliases - aliases):
+                yield Ya360UserAliasRemoved(org_id=org_id, user=user, alias=alias)
+    for user_id in delta.removed:
+        yield Ya360UserRemoved(org_id=org_id, user_id=user_id, previous=delta.previous.get(user_id))
+
+
+def group_events(org_id: str, delta: Ya360SyncDelta) -> Iterator[Ya360DirectoryEvent]:
+    for group in delta.added:
+        yield Ya360GroupCreated(org_id=org_id, group=group)
+    for group in delta.changed:
+        previous = delta.previous.get(str(group.id))
+        if previous is None:
+            yield Ya360GroupCreated(org_id=org_id, group=group)
+            continue
+        changed = changed_fields(previous, group)
+        if not changed:
+            continue
+        yield Ya360GroupUpdated(org_id=org_id, group=group, previous=previous, fields=changed)
+        if 'members' in changed:
+            previous_members = _member_keys(previous)
+            members = _member_keys(group)
+            for key, member in members.items():
+                if key not in previous_members:
+                    yield Ya360MemberAdded(org_id=org_id, group=group, member=member)
+            for key, member in previous_members.items():
+                if key not in members:
+                    yield Ya360MemberRemoved(org_id=org_id, group=group, member=member)
+    for group_id in delta.removed:
+        yield Ya360GroupRemoved(org_id=org_id, group_id=group_id, previous=delta.previous.get(group_id))
+
+
+def department_events(org_id: str, delta: Ya360SyncDelta) -> Iterator[Ya360DirectoryEvent]:
+    for department in delta.added:
+        yield Ya360DepartmentCreated(org_id=org_id, department=department)
+    for department in delta.changed:
+        previous = delta.previous.get(str(department.id))
+        if previous is None:
+            yield Ya360DepartmentCreated(org_id=org_id, department=department)
+            continue
+        changed = changed_fields(previous, department)
+        if changed:
+            yield Ya360DepartmentUpdated(org_id=org_id, department=department, previous=previous, fields=changed)
+    for department_id in delta.removed:
+        yield Ya360DepartmentRemoved(
+            org_id=org_id,
+            department_id=department_id,
+            previous=delta.previous.get(department_id)
+        )
+
+
+def directory_events(delta: Ya360DirectoryDelta) -> Iterator[Ya360DirectoryEvent]:
+    yield from department_events(delta.org_id, delta.departments)
+    yield from user_events(delta.org_id, delta.users)
+    yield from group_events(delta.org_id, delta.groups)
+
+
+class Ya360DirectoryWatcher:
+
+    def __init__(self,
+                 sync: Ya360DirectorySync,
+                 interval: float = 60.0,
+                 min_interval: float = 5.0,
+                 max_interval: float = 600.0,
+                 initial_events: bool = False):
+        self.sync = sync
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_events = initial_events
+
+    def _adapt(self, changes: int):
+        if changes:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+
+    async def _poll(self) -> Optional[Ya360DirectoryDelta]:
+        try:
+            delta = await self.sync.sync()
+        except Ya360Exception as error:
+            logger.warning(f'Ya360DirectoryWatcher. Sync of organization {self.sync.org_id} failed: {error.message}')
+            self.interval = min(self.max_interval, self.interval * 2)
+            return None
+        self._adapt(len(delta.users) + len(delta.groups) + len(delta.departments))
+        return delta
+
+    async def __aiter__(self) -> AsyncIterator[Ya360DirectoryEvent]:
+        baseline = not self.initial_events and not any(self.sync.hashes.values())
+        while True:
+            delta = await self._poll()
+            if delta is not None:
+                if not baseline:
+                    for event in directory_events(delta):
+                        yield event
+                baseline = False
+            await asyncio.sleep(self.interval)
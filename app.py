@@ -14,14 +14,18 @@ from aio_ya_360.exceptions import Ya360Exception
 async def main():
     env = Env()
     env.read_env()
-    client = AioYa360Client(
+    async with AioYa360Client(
         client_secrets=Ya360ClientSecrets.from_json(
             data={
                 'client_id': env.str('CLIENT_ID'),
                 'client_secret': env.str('CLIENT_SECRET')
             }
         )
-    )
+    ) as client:
+        await main_with_client(client=client, env=env)
+
+
+async def main_with_client(client: AioYa360Client, env: Env):
     try:
         organizations: list[Ya360Organization] = await Ya360Organization.from_api(client=client)
 
@@ -0,0 +1,92 @@
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Any, Callable
+
+from aio_ya_360 import Ya360User
+from aio_ya_360.base import Ya360UserContact, Ya360UserName
+
+timezones = ['Europe/Moscow', 'Asia/Yekaterinburg', 'Asia/Novosibirsk', 'Europe/Kaliningrad']
+languages = ['ru', 'en']
+genders = ['male', 'female']
+
+
+def synthetic_user(number: int) -> dict:
+    return {
+        'about': '',
+        'aliases': [],
+        'avatarId': '',
+        'birthday': '1990-01-01',
+        'contacts': [
+            {'alias': False, 'label': '', 'main': True, 'synthetic': True, 'type': 'email',
+             'value': f'user{number}@example.com'},
+            {'alias': False, 'label': 'work', 'main': False, 'synthetic': False, 'type': 'phone',
+             'value': f'+7000{number:07d}'},
+        ],
+        'createdAt': '2024-01-01T00:00:00.000Z',
+        'departmentID': number % 50 + 1,
+        'email': f'user{number}@example.com',
+        'externalId': '',
+        'gender': genders[number % len(genders)],
+        'groups': [],
+        'id': str(1130000000000000 + number),
+        'isAdmin': False,
+        'isDismissed': False,
+        'isEnabled': True,
+        'isRobot': False,
+        'language': languages[number % len(languages)],
+        'name': {'first': f'First{number}', 'last': f'Last{number}', 'middle': ''},
+        'nickname': f'user{number}',
+        'position': 'Engineer',
+        'timezone': timezones[number % len(timezones)],
+        'updatedAt': '2024-01-01T00:00:00.000Z',
+    }
+
+
+def unslotted(cls: type) -> type:
+    return make_dataclass(f'{cls.__name__}Dict', [(field.name, field.type) for field in fields(cls)])
+
+
+UserDict = unslotted(Ya360User)
+UserContactDict = unslotted(Ya360UserContact)
+UserNameDict = unslotted(Ya360UserName)
+
+
+def user_dict_from_json(data: dict) -> Any:
+    return UserDict(**{
+        **{field.name: data.get(field.name) for field in fields(UserDict)},
+        'departmentId': data.get('departmentID'),
+        'contacts': [UserContactDict(**contact) for contact in data['contacts']],
+        'name': UserNameDict(**data['name']),
+    })
+
+
+def measure(pages: list[bytes], from_json: Callable[[dict], Any]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    users = [from_json(user) for page in pages for user in json.loads(page)['users']]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(users), current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-user memory footprint of directory snapshots')
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--per-page', type=int, default=1000)
+    args = parser.parse_args()
+    pages = [
+        json.dumps({'users': [synthetic_user(number)
+                              for number in range(start, min(start + args.per_page, args.users))]}).encode()
+        for start in range(0, args.users, args.per_page)
+    ]
+    for name, from_json in (('dataclass', user_dict_from_json), ('slotted+interned', Ya360User.from_json)):
+        count, size = measure(pages, from_json)
+        print(f'{name:>18}: {size / 1024 / 1024:8.1f} MiB total, {size / count:7.1f} bytes per user')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import gc
+import json
+import time
+from typing import Any, Callable
+
+from aio_ya_360 import Ya360User
+from aio_ya_360.base import Ya360UserContact, Ya360UserName
+from aio_ya_360.base.json_backend import get_json_backend, json_backends
+from benchmarks.model_memory import synthetic_user
+
+
+def keyword_user_from_json(data: dict) -> Ya360User:
+    return Ya360User(
+        about=data.get('about'),
+        aliases=data.get('aliases'),
+        avatarId=data.get('avatarId'),
+        birthday=data.get('birthday'),
+        contacts=[
+            Ya360UserContact(
+                alias=contact.get('alias'),
+                label=contact.get('label'),
+                main=contact.get('main'),
+                synthetic=contact.get('synthetic'),
+                type=contact.get('type'),
+                value=contact.get('value'),
+            ) for contact in data.get('contacts')
+        ],
+        createdAt=data.get('createdAt'),
+        departmentId=data.get('departmentID'),
+        email=data.get('email'),
+        externalId=data.get('externalId'),
+        gender=data.get('gender'),
+        groups=data.get('groups'),
+        id=data.get('id'),
+        isAdmin=data.get('isAdmin'),
+        isDismissed=data.get('isDismissed'),
+        isEnabled=data.get('isEnabled'),
+        isRobot=data.get('isRobot'),
+        language=data.get('language'),
+        name=Ya360UserName(
+            first=data.get('name').get('first'),
+            last=data.get('name').get('last'),
+            middle=data.get('name').get('middle'),
+        ),
+        nickname=data.get('nickname'),
+        position=data.get('position'),
+        timezone=data.get('timezone'),
+        updatedAt=data.get('updatedAt'),
+    )
+
+
+def best_of(repeat: int, function: Callable[[], Any]) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+        gc.enable()
+    return best
+
+
+def measure(pages: list[bytes],
+            loads: Callable[[bytes], Any],
+            from_json: Callable[[dict], Any],
+            repeat: int) -> tuple[float, float]:
+    decoded = [loads(page) for page in pages]
+    decode = best_of(repeat, lambda: [loads(page) for page in pages])
+    build = best_of(repeat, lambda: [from_json(user) for page in decoded for user in page['users']])
+    return decode, build
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode and model construction time of user listing pages')
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--per-page', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    pages = [
+        json.dumps({'users': [synthetic_user(page * args.per_page + number)
+                              for number in range(args.per_page)]}).encode()
+        for page in range(args.pages)
+    ]
+    candidates = [('json + keyword construction', json.loads, keyword_user_from_json)]
+    for name in json_backends:
+        try:
+            backend = get_json_backend(name)
+        except ImportError:
+            continue
+        candidates.append((f'{name} + Ya360User.from_json', backend.loads, Ya360User.from_json))
+    for name, loads, from_json in candidates:
+        decode, build = measure(pages, loads, from_json, args.repeat)
+        print(f'{name:>30}: decode {decode:6.3f}s, build {build:6.3f}s, total {decode + build:6.3f}s')
+
+
+if __name__ == '__main__':
+    main()